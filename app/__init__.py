@@ -1,10 +1,19 @@
 from flask import Flask
 from flask_migrate import Migrate
+from werkzeug.middleware.proxy_fix import ProxyFix
 from .extensions import db, login_manager
 from .config import Config
+from . import cache, database, metrics, profiling, responses, storage
+from app.cache.api import cache_api
+from app.database.api import database_api
+from app.database.seed import seed
+from app.database.slow_queries import slow_queries_cli
+from app.metrics.api import metrics_api
+from app.storage.routes import storage as storage_bp
 from app.auth.models import User
 from app.auth.routes import auth
 from app.auth.api import auth_api
+from app.auth.cli import users_cli
 from app.main.routes import main
 from app.dashboard.routes import dashboard
 from app.profile.routes import profile
@@ -12,15 +21,28 @@ from app.profile.api import profile_api
 from app.projects.routes import project
 from app.projects.api import project_api
 from app.search import bp as search_bp
+from app.search.api import directory_api
 
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    # Take the client address and scheme from the trusted proxies' headers
+    proxies = app.config.get("TRUSTED_PROXY_COUNT", 0)
+    if proxies:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies)
+
     # Initialize extensions
     db.init_app(app)
+    database.init_app(app)
     login_manager.init_app(app)
+    cache.init_app(app)
+    storage.init_app(app)
+    profiling.init_app(app)
+    metrics.init_app(app)
+    # Last: its after_request hook runs first, compressing the final body
+    responses.init_app(app)
 
     # Register web blueprints
     app.register_blueprint(main)
@@ -29,11 +51,21 @@ def create_app():
     app.register_blueprint(project)
     app.register_blueprint(search_bp)
     app.register_blueprint(dashboard)
+    app.register_blueprint(storage_bp)
 
     # Register API blueprints
     app.register_blueprint(auth_api)
     app.register_blueprint(project_api)
     app.register_blueprint(profile_api)
+    app.register_blueprint(cache_api)
+    app.register_blueprint(database_api)
+    app.register_blueprint(metrics_api)
+    app.register_blueprint(directory_api)
+
+    # CLI commands
+    app.cli.add_command(users_cli)
+    app.cli.add_command(seed)
+    app.cli.add_command(slow_queries_cli)
 
     # Shell context processor
     @app.shell_context_processor
@@ -1,15 +1,16 @@
 from flask import Blueprint
-from .models import User
+from .models import User  # noqa: F401 - re-exported
 from app.extensions import login_manager
+from .user_cache import load_user_snapshot
 
 # Define the blueprint
 auth = Blueprint("auth", __name__)
 
 
-# User loader for Flask-Login
+# User loader for Flask-Login; handlers get a cached UserSnapshot
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return load_user_snapshot(int(user_id))
 
 
 # Import routes AFTER blueprint creation
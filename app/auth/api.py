@@ -1,22 +1,44 @@
-from flask import Blueprint
+from flask import Blueprint, abort, current_app
 from .auth import handle_login, handle_register, handle_logout
+from .hashing import HashingBusy
+from .throttle import LoginThrottled, get_login_throttle
 from flask import request, jsonify
 
 auth_api = Blueprint("auth_api", __name__)
 
 
+def _busy():
+    response = jsonify({"error": "Server busy, please retry"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+
 @auth_api.route("/api/login", methods=["POST"])
 def login():
     data = request.get_json()
     try:
-        handle_login(data)
+        handle_login(data, client_ip=request.remote_addr)
         return jsonify({"success": True, "message": "Login successful"}), 200
+    except LoginThrottled as e:
+        response = jsonify({"error": str(e)})
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, 429
+    except HashingBusy:
+        return _busy()
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception:
         return jsonify({"error": "Internal server error"}), 500
 
 
+@auth_api.route("/api/login/throttle", methods=["GET"])
+def throttle_stats():
+    """Allowed/rejected login attempt counters (this worker only)"""
+    if not current_app.config.get("LOGIN_THROTTLE_STATS_ENABLED"):
+        abort(404)
+    return jsonify({"counters": get_login_throttle().snapshot()}), 200
+
+
 @auth_api.route("/api/register", methods=["POST"])
 def register():
     data = request.get_json()
@@ -25,6 +47,8 @@ def register():
         return jsonify(
             {"success": True, "message": "Registration " "successful"}
         ), 201
+    except HashingBusy:
+        return _busy()
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception:
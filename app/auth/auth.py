@@ -1,16 +1,26 @@
 from flask_login import login_user, logout_user
 from .auth_database_manager import AuthDatabaseManager
+from .hashing import HashingBusy
+from .throttle import check_login_allowed
 
 
 # Login route logic
-def handle_login(data):
+def handle_login(data, client_ip=None):
+    if not isinstance(data, dict):
+        raise ValueError("Username and password are required")
     username = data.get("username")
     password = data.get("password")
+    # JSON bodies can carry numbers, lists ... where strings are expected
+    if not (isinstance(username, str) and isinstance(password, str)):
+        raise ValueError("Username and password are required")
     if not username or not password:
         raise ValueError("Username and password are required")
 
+    # Throttle before the user lookup so floods never reach the hasher
+    check_login_allowed(username, client_ip)
+
     user = AuthDatabaseManager.get_user_by_username(username)
-    if user and user.check_password(password):
+    if user and AuthDatabaseManager.check_password(user, password):
         try:
             login_user(user)
             return True
@@ -32,6 +42,8 @@ def handle_register(data):
         user = AuthDatabaseManager.create_user(username, email, password)
         if not user:
             raise ValueError("An error occurred during registration")
+    except HashingBusy:
+        raise
     except Exception as e:
         raise ValueError(f"Registration failed: {str(e)}")
 
@@ -16,6 +16,14 @@ class AuthDatabaseManager:
         db.session.commit()
         return user
 
+    @staticmethod
+    def check_password(user, password):
+        """Verify a password, persisting the hash if it was upgraded."""
+        matches = user.check_password(password)
+        if matches and user in db.session.dirty:
+            db.session.commit()
+        return matches
+
     @staticmethod
     def get_user_by_username(username):
         """Fetches a user by username."""
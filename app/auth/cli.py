@@ -0,0 +1,197 @@
+import csv
+import itertools
+import os
+import time
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import func, insert, or_
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from .hashing import DEFAULT_METHOD, _hash
+from .models import User
+
+users_cli = AppGroup("users", help="Manage user accounts.")
+
+REQUIRED_COLUMNS = ("username", "email", "password")
+OPTIONAL_COLUMNS = ("contact_info", "bio")
+
+
+def _batches(rows, size):
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _existing(usernames, emails):
+    """Usernames and emails already taken, in one query"""
+    rows = db.session.execute(
+        db.select(User.username, User.email).where(
+            or_(
+                User.username.in_(usernames),
+                func.lower(User.email).in_([e.lower() for e in emails]),
+            )
+        )
+    )
+    taken_names, taken_emails = set(), set()
+    for username, email in rows:
+        taken_names.add(username)
+        taken_emails.add(email.lower())
+    return taken_names, taken_emails
+
+
+def _screen(batch, seen_names, seen_emails):
+    """Split a batch into (accepted rows, [(row, reason), ...])"""
+    accepted, rejected = [], []
+    for row in batch:
+        row = {k: (v or "").strip() for k, v in row.items() if k}
+        missing = [c for c in REQUIRED_COLUMNS if not row.get(c)]
+        if missing:
+            rejected.append((row, f"missing {', '.join(missing)}"))
+        elif row["username"] in seen_names:
+            rejected.append((row, "duplicate username in file"))
+        elif row["email"].lower() in seen_emails:
+            rejected.append((row, "duplicate email in file"))
+        else:
+            accepted.append(row)
+            seen_names.add(row["username"])
+            seen_emails.add(row["email"].lower())
+
+    if accepted:
+        taken_names, taken_emails = _existing(
+            [row["username"] for row in accepted],
+            [row["email"] for row in accepted],
+        )
+        fresh = []
+        for row in accepted:
+            if row["username"] in taken_names:
+                rejected.append((row, "username already exists"))
+            elif row["email"].lower() in taken_emails:
+                rejected.append((row, "email already exists"))
+            else:
+                fresh.append(row)
+        accepted = fresh
+    return accepted, rejected
+
+
+def _insert(accepted, values):
+    """Insert a batch at once, falling back to one row at a time when a
+    row conflicts; returns (inserted values, [(row, reason), ...])"""
+    try:
+        db.session.execute(insert(User), values)
+        db.session.commit()
+        return values, []
+    except IntegrityError:
+        # Someone registered one of these names meanwhile
+        db.session.rollback()
+
+    inserted, rejected = [], []
+    for row, value in zip(accepted, values):
+        try:
+            db.session.execute(insert(User), [value])
+            db.session.commit()
+            inserted.append(value)
+        except IntegrityError:
+            db.session.rollback()
+            rejected.append((row, "conflict while inserting"))
+    return inserted, rejected
+
+
+@users_cli.command("import")
+@click.argument("csv_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch-size", default=500, show_default=True)
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Hashing processes [default: CPU count]",
+)
+@click.option(
+    "--rejects",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Where to write rejected rows [default: <csv_file>.rejects.csv]",
+)
+@click.option("--dry-run", is_flag=True, help="Validate without inserting.")
+def import_users(csv_file, batch_size, workers, rejects, dry_run):
+    """Create users from a CSV with username, email and password columns.
+
+    contact_info and bio columns are imported when present. Rows are
+    streamed in batches: collisions are checked with one query per batch,
+    passwords hashed on a process pool and the batch inserted at once.
+    """
+    method = current_app.config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+    workers = workers or os.cpu_count() or 1
+    rejects = rejects or f"{os.path.splitext(csv_file)[0]}.rejects.csv"
+
+    verb = "validated" if dry_run else "inserted"
+    seen_names, seen_emails = set(), set()
+    inserted = rejected_count = 0
+    started = time.perf_counter()
+
+    with open(csv_file, newline="", encoding="utf-8-sig") as src, open(
+        rejects, "w", newline="", encoding="utf-8"
+    ) as rej, (
+        # Nothing is hashed in a dry run
+        nullcontext() if dry_run else ProcessPoolExecutor(max_workers=workers)
+    ) as pool:
+        reader = csv.DictReader(src)
+        missing = set(REQUIRED_COLUMNS) - set(reader.fieldnames or ())
+        if missing:
+            raise click.UsageError(
+                f"CSV is missing columns: {', '.join(sorted(missing))}"
+            )
+        # Plain-text passwords are never copied into the rejects file
+        columns = [c for c in reader.fieldnames if c and c != "password"]
+        rejects_writer = csv.DictWriter(
+            rej, fieldnames=columns + ["reason"], extrasaction="ignore"
+        )
+        rejects_writer.writeheader()
+
+        for number, batch in enumerate(_batches(reader, batch_size), 1):
+            batch_started = time.perf_counter()
+            accepted, rejected = _screen(batch, seen_names, seen_emails)
+
+            if dry_run:
+                hashes = itertools.repeat(None)
+            else:
+                hashes = pool.map(
+                    _hash,
+                    [row["password"] for row in accepted],
+                    itertools.repeat(method),
+                    chunksize=max(1, len(accepted) // (workers * 4)),
+                )
+            values = [
+                {
+                    "username": row["username"],
+                    "email": row["email"],
+                    "password": pwhash,
+                    **{c: row.get(c) or None for c in OPTIONAL_COLUMNS},
+                }
+                for row, pwhash in zip(accepted, hashes)
+            ]
+
+            if values and not dry_run:
+                values, conflicts = _insert(accepted, values)
+                rejected.extend(conflicts)
+
+            for row, reason in rejected:
+                rejects_writer.writerow({**row, "reason": reason})
+            inserted += len(values)
+            rejected_count += len(rejected)
+
+            elapsed = time.perf_counter() - batch_started
+            click.echo(
+                f"batch {number}: {len(values)} {verb}, "
+                f"{len(rejected)} rejected, "
+                f"{len(batch) / elapsed:.0f} rows/s"
+            )
+
+    total = time.perf_counter() - started
+    click.echo(
+        f"{inserted} users {verb}, {rejected_count} rejected "
+        f"in {total:.1f}s; rejects written to {rejects}"
+    )
@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Werkzeug's own default, spelled out so needs_rehash() can compare it
+DEFAULT_METHOD = "scrypt:32768:8:1"
+
+
+class HashingBusy(RuntimeError):
+    """Raised when every hashing process is busy and the queue is full"""
+
+
+def needs_rehash(pwhash, method):
+    """True when a stored hash was made with other parameters"""
+    return pwhash.split("$", 1)[0] != method
+
+
+# Run inside the worker processes; must stay importable module functions
+def _hash(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def _verify(pwhash, password, method):
+    """Returns (matches, new_hash); new_hash is set when rehashed"""
+    if not check_password_hash(pwhash, password):
+        return False, None
+    if needs_rehash(pwhash, method):
+        return True, generate_password_hash(password, method=method)
+    return True, None
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    method = "forkserver" if "forkserver" in methods else "spawn"
+    return multiprocessing.get_context(method)
+
+
+class PasswordHasher:
+    """Runs password hashing on a bounded process pool.
+
+    At most ``workers + queue_size`` operations are accepted at once so a
+    login burst queues in the pool instead of pinning request threads;
+    with zero workers hashing runs inline in the caller. Pool processes
+    are started by a forkserver (spawn where there is none), not forked
+    from the web worker with the whole app in memory.
+    """
+
+    def __init__(
+        self, workers, queue_size, method=DEFAULT_METHOD, timeout=None
+    ):
+        self.workers = workers
+        self.method = method
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + queue_size)
+        self._executor = (
+            ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context())
+            if workers
+            else None
+        )
+
+    def _call(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy("Too many password operations in progress")
+        if self._executor is None:
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # A timed-out task keeps its worker busy, so its slot is only
+        # given back once it has actually finished
+        future.add_done_callback(lambda _f: self._slots.release())
+        try:
+            return future.result(self.timeout)
+        except FutureTimeout:
+            raise HashingBusy("Password hashing timed out")
+
+    def hash(self, password):
+        return self._call(_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        """Check a password; returns (matches, new_hash or None)"""
+        return self._call(_verify, pwhash, password, self.method)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+_hashers = {}
+_hashers_lock = threading.Lock()
+
+
+def get_hasher():
+    """Process-local hasher configured from the current app"""
+    config = current_app.config if has_app_context() else {}
+    # Keyed by pid: a pool inherited across fork() has no live workers
+    key = os.getpid()
+    hasher = _hashers.get(key)
+    if hasher is None:
+        with _hashers_lock:
+            hasher = _hashers.get(key)
+            if hasher is None:
+                hasher = _hashers[key] = PasswordHasher(
+                    config.get("PASSWORD_HASH_WORKERS", 0),
+                    config.get("PASSWORD_HASH_QUEUE", 32),
+                    method=config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD),
+                    timeout=config.get("PASSWORD_HASH_TIMEOUT"),
+                )
+    return hasher
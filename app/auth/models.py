@@ -1,7 +1,7 @@
 from ..extensions import db
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
-from app.aws.s3 import presigned_get_url
+from app.storage import get_storage
+from .hashing import get_hasher
 
 
 class User(db.Model, UserMixin):
@@ -11,19 +11,38 @@ class User(db.Model, UserMixin):
     password = db.Column(db.String(256), nullable=False)
     contact_info = db.Column(db.String(256), nullable=True)
     avatar_url = db.Column(db.String(256), nullable=True)
+    # {"64": {"webp": key, "jpeg": key}, ...} written by the avatar pipeline
+    avatar_variants = db.Column(db.JSON, nullable=True)
     skills = db.relationship("UserSkill", back_populates="user", cascade="all, delete-orphan")
     @property
     def avatar_presigned(self):
         if not self.avatar_url:
             return None
-        return presigned_get_url(self.avatar_url, 3600)
+        return get_storage().get_url(self.avatar_url, 3600)
+
+    def avatar_key_for(self, size, fmt="jpeg"):
+        """Key of the smallest avatar variant covering a ``size`` px slot"""
+        if not self.avatar_variants:
+            # Avatars uploaded before the pipeline only have the original
+            return self.avatar_url if fmt == "jpeg" else None
+        sizes = sorted(int(s) for s in self.avatar_variants)
+        fitting = next((s for s in sizes if s >= size), sizes[-1])
+        return self.avatar_variants[str(fitting)].get(fmt)
+
+    def avatar_presigned_for(self, size, fmt="jpeg"):
+        key = self.avatar_key_for(size, fmt)
+        return get_storage().get_url(key, 3600) if key else None
 
     bio = db.Column(db.Text, nullable=True)
 
-    # Method to hash the password
+    # Method to hash the password (runs on the hashing process pool)
     def set_password(self, password):
-        self.password = generate_password_hash(password)
+        self.password = get_hasher().hash(password)
 
-    # Method to check the hashed password
+    # Method to check the hashed password; on success a hash made with
+    # outdated parameters is replaced (the caller commits it)
     def check_password(self, password):
-        return check_password_hash(self.password, password)
+        matches, new_hash = get_hasher().verify(self.password, password)
+        if new_hash:
+            self.password = new_hash
+        return matches
@@ -0,0 +1,136 @@
+import math
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from flask import current_app
+from app.cache import LocalCache, get_cache
+
+
+class LoginThrottled(Exception):
+    """Raised before any password work when a login bucket is empty"""
+
+    def __init__(self, retry_after):
+        super().__init__("Too many login attempts")
+        self.retry_after = retry_after
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by (scope, value), e.g. ("ip", "10.0.0.1").
+
+    ``limits`` maps a scope to (burst, tokens refilled per second). The
+    store is any cache backend: the default in-process LocalCache, or the
+    app's shared cache so every worker sees the same buckets (updates to
+    a shared store are last-writer-wins, which is fine for throttling).
+    Within a worker, hits on the same bucket are serialised by one of
+    ``stripes`` locks, so round-trips to a shared store for different
+    users and IPs do not wait on each other.
+    """
+
+    def __init__(self, limits, store=None, max_keys=10000, stripes=64):
+        self.limits = limits
+        self.store = store or LocalCache(max_entries=max_keys)
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self._lock = threading.Lock()  # guards _counts only
+        self._counts = Counter()
+
+    def _key(self, scope, value):
+        return f"login_bucket:{scope}:{value}"
+
+    def _count(self, *names):
+        with self._lock:
+            for name in names:
+                self._counts[name] += 1
+
+    def hit(self, **keys):
+        """Take one token from every bucket named in ``keys``.
+
+        Either all buckets are charged or none is. Returns 0 when allowed,
+        otherwise the seconds until every bucket has a token again.
+        """
+        keys = {scope: v for scope, v in keys.items() if v is not None}
+        # Stripes are taken in index order so two hits cannot deadlock
+        stripes = sorted(
+            {
+                hash(self._key(scope, value)) % len(self._stripes)
+                for scope, value in keys.items()
+            }
+        )
+        with ExitStack() as stack:
+            for index in stripes:
+                stack.enter_context(self._stripes[index])
+            now = time.time()
+            buckets = {}
+            wait = 0.0
+            rejected = []
+            for scope, value in keys.items():
+                burst, rate = self.limits[scope]
+                stored = self.store.get(self._key(scope, value))
+                if stored is None:
+                    tokens = burst
+                else:
+                    tokens, updated = stored
+                    tokens = min(burst, tokens + (now - updated) * rate)
+                buckets[scope] = (value, tokens)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / rate)
+                    rejected.append(f"rejected_{scope}")
+
+            if wait:
+                self._count("rejected", *rejected)
+                return max(1, math.ceil(wait))
+
+            for scope, (value, tokens) in buckets.items():
+                burst, rate = self.limits[scope]
+                self.store.set(
+                    self._key(scope, value),
+                    [tokens - 1, now],
+                    # Forget the bucket once it would be full again
+                    ttl=math.ceil(burst / rate) + 1,
+                )
+        self._count("allowed")
+        return 0
+
+    def snapshot(self):
+        """Counters for this worker: allowed, rejected, rejected_<scope>"""
+        with self._lock:
+            return dict(self._counts)
+
+
+def get_login_throttle():
+    """Login limiter of the current app (created on first use)"""
+    app = current_app._get_current_object()
+    throttle = app.extensions.get("login_throttle")
+    if throttle is None:
+        config = app.config
+        limits = {
+            "user": (
+                config.get("LOGIN_THROTTLE_USER_BURST", 5),
+                config.get("LOGIN_THROTTLE_USER_PER_MINUTE", 5) / 60,
+            ),
+            "ip": (
+                config.get("LOGIN_THROTTLE_IP_BURST", 30),
+                config.get("LOGIN_THROTTLE_IP_PER_MINUTE", 30) / 60,
+            ),
+        }
+        shared = config.get("LOGIN_THROTTLE_BACKEND", "local") == "cache"
+        throttle = app.extensions.setdefault(
+            "login_throttle",
+            TokenBucketLimiter(
+                limits,
+                store=get_cache() if shared else None,
+                max_keys=config.get("LOGIN_THROTTLE_MAX_KEYS", 10000),
+            ),
+        )
+    return throttle
+
+
+def check_login_allowed(username, client_ip=None):
+    """Charge the username and IP buckets or raise LoginThrottled"""
+    if not current_app.config.get("LOGIN_THROTTLE_ENABLED", True):
+        return
+    retry_after = get_login_throttle().hit(
+        user=username.strip().lower(), ip=client_ip
+    )
+    if retry_after:
+        raise LoginThrottled(retry_after)
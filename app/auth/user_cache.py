@@ -0,0 +1,107 @@
+from flask import current_app
+from flask_login import UserMixin
+from app.cache import cache_is_shared, cache_stats, get_cache
+from app.extensions import db
+from .models import User
+
+CACHE_NAME = "user_loader"
+
+# Columns request handling reads from current_user; the password hash is
+# deliberately left out of the cache
+SNAPSHOT_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "contact_info",
+    "bio",
+    "avatar_url",
+    "avatar_variants",
+)
+
+
+def _key(user_id):
+    return f"user:{user_id}"
+
+
+class UserSnapshot(UserMixin):
+    """Read-only stand-in for User, built from the user-loader cache.
+
+    Anything that is not a snapshot field (relationships, password,
+    check_password ...) loads the ORM User once and delegates to it.
+    """
+
+    __slots__ = SNAPSHOT_FIELDS + ("_user",)
+
+    def __init__(self, row):
+        for name in SNAPSHOT_FIELDS:
+            object.__setattr__(self, name, row.get(name))
+        object.__setattr__(self, "_user", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            "UserSnapshot is read-only; update the User from .orm instead"
+        )
+
+    def __getattr__(self, name):
+        return getattr(self.orm, name)
+
+    @property
+    def orm(self):
+        """The full ORM User (loaded on first use)"""
+        if self._user is None:
+            object.__setattr__(self, "_user", db.session.get(User, self.id))
+        return self._user
+
+    # Pure functions of the snapshot fields, shared with the model
+    avatar_presigned = User.avatar_presigned
+    avatar_key_for = User.avatar_key_for
+    avatar_presigned_for = User.avatar_presigned_for
+
+    def __repr__(self):
+        return f"<UserSnapshot {self.id} {self.username!r}>"
+
+
+def user_to_row(user):
+    return {name: getattr(user, name) for name in SNAPSHOT_FIELDS}
+
+
+def _caching():
+    # invalidate_user() only reaches the local cache of the worker that
+    # made the change, so other workers would serve stale snapshots
+    return cache_is_shared() or current_app.config.get(
+        "USER_CACHE_LOCAL", False
+    )
+
+
+def load_user_snapshot(user_id):
+    """Flask-Login loader: a cached snapshot, the database on a miss.
+
+    Snapshots are only cached in a cache shared by every worker (or with
+    USER_CACHE_LOCAL); otherwise each request reads the row.
+    """
+    cache = get_cache() if _caching() else None
+    row = None
+    if cache is not None:
+        row = cache.get(_key(user_id))
+        cache_stats.record(CACHE_NAME, hit=row is not None)
+    if row is None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        row = user_to_row(user)
+        if cache is not None:
+            cache.set(
+                _key(user_id),
+                row,
+                ttl=current_app.config.get("USER_CACHE_TTL"),
+            )
+    return UserSnapshot(row)
+
+
+def orm_user(user):
+    """The ORM User behind a snapshot (a User is returned unchanged)"""
+    return user.orm if isinstance(user, UserSnapshot) else user
+
+
+def invalidate_user(*user_ids):
+    get_cache().delete(*(_key(user_id) for user_id in user_ids))
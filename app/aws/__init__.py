@@ -1,9 +1,23 @@
-from .s3 import s3_client, s3_resource, s3_bucket, upload_fileobj_private, object_url
+from .s3 import (
+    get_s3_client,
+    get_s3_resource,
+    s3_bucket,
+    upload_fileobj_private,
+    upload_bytes_private,
+    download_fileobj,
+    object_url,
+    presigned_get_url,
+    presign_many,
+)
 
 __all__ = [
-    "s3_client",
-    "s3_resource",
+    "get_s3_client",
+    "get_s3_resource",
     "s3_bucket",
     "upload_fileobj_private",
+    "upload_bytes_private",
+    "download_fileobj",
     "object_url",
+    "presigned_get_url",
+    "presign_many",
 ]
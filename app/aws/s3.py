@@ -1,44 +1,128 @@
 # app/aws/s3.py
 import os
+import threading
+import time
 import uuid
 import mimetypes
-import boto3
-from botocore.config import Config
+from datetime import datetime, timezone
 from werkzeug.utils import secure_filename
+from app.cache import LocalCache, cache_stats
+from app.profiling import timed
 
 AWS_REGION = os.getenv("AWS_REGION")
 S3_BUCKET = os.getenv("S3_BUCKET")
+# Point at a local S3 stand-in (MinIO, moto server) instead of AWS
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+
+# Presigned URLs are signed as of the start of a window of this many
+# seconds, so every worker hands out the same URL for the whole window
+PRESIGN_WINDOW = int(os.getenv("S3_PRESIGN_WINDOW", "900"))
+
+# Connection pool and multipart transfer tuning (see configure())
+_tuning = {
+    "max_pool_connections": int(os.getenv("S3_MAX_POOL_CONNECTIONS", "10")),
+    "multipart_threshold": int(
+        os.getenv("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024))
+    ),
+    "multipart_chunksize": int(
+        os.getenv("S3_MULTIPART_CHUNKSIZE", str(8 * 1024 * 1024))
+    ),
+    "max_concurrency": int(os.getenv("S3_TRANSFER_CONCURRENCY", "10")),
+}
 
 _aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
 _aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
 
-_boto_cfg = Config(
-    region_name=AWS_REGION,
-    retries={"max_attempts": 5, "mode": "standard"},
-    connect_timeout=5,
-    read_timeout=30,
-)
+# boto3 is imported and its clients built on first use, not at import time:
+# loading the session and service models is the slowest part of startup.
+_clients = {}
+_clients_lock = threading.Lock()
 
-s3_client = boto3.client(
-    "s3",
-    config=_boto_cfg,
-    aws_access_key_id=_aws_access_key_id,
-    aws_secret_access_key=_aws_secret_access_key,
-)
 
-s3_resource = boto3.resource(
-    "s3",
-    config=_boto_cfg,
-    aws_access_key_id=_aws_access_key_id,
-    aws_secret_access_key=_aws_secret_access_key,
-)
+def _build(kind):
+    import boto3
+    from botocore.config import Config
+
+    _install_signing_clock()
+    factory = boto3.client if kind == "client" else boto3.resource
+    return factory(
+        "s3",
+        config=Config(
+            region_name=AWS_REGION,
+            # SigV4, whose signing time _sign can pin (see _signing_clock)
+            signature_version="s3v4",
+            retries={"max_attempts": 5, "mode": "standard"},
+            connect_timeout=5,
+            read_timeout=30,
+            max_pool_connections=_tuning["max_pool_connections"],
+        ),
+        endpoint_url=S3_ENDPOINT_URL,
+        aws_access_key_id=_aws_access_key_id,
+        aws_secret_access_key=_aws_secret_access_key,
+    )
+
+
+def _get(kind):
+    # Keyed by pid: clients must not be shared across a fork
+    cache_key = (kind, os.getpid())
+    instance = _clients.get(cache_key)
+    if instance is None:
+        with _clients_lock:
+            instance = _clients.get(cache_key)
+            if instance is None:
+                instance = _clients[cache_key] = _build(kind)
+    return instance
+
+
+def configure(**tuning):
+    """Override pool/multipart settings; clients are rebuilt on next use.
+
+    Accepts max_pool_connections, multipart_threshold, multipart_chunksize
+    and max_concurrency.
+    """
+    unknown = set(tuning) - set(_tuning)
+    if unknown:
+        raise TypeError(f"Unknown S3 tuning options: {', '.join(unknown)}")
+    with _clients_lock:
+        _tuning.update({k: v for k, v in tuning.items() if v is not None})
+        _clients.clear()
+
+
+def transfer_config():
+    """TransferConfig for managed (multipart) uploads and downloads"""
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=_tuning["multipart_threshold"],
+        multipart_chunksize=_tuning["multipart_chunksize"],
+        max_concurrency=_tuning["max_concurrency"],
+    )
+
+
+def get_s3_client():
+    """Shared, thread-safe S3 client of this process (created lazily)"""
+    return _get("client")
+
+
+def get_s3_resource():
+    """Lazily created S3 resource; prefer get_s3_client() in new code"""
+    return _get("resource")
+
+
+def __getattr__(name):
+    # Backwards compatibility for the former module-level instances
+    if name == "s3_client":
+        return get_s3_client()
+    if name == "s3_resource":
+        return get_s3_resource()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def s3_bucket():
     """Returns a bucket object you can interact with"""
     if not S3_BUCKET:
         raise RuntimeError("S3_BUCKET is not set")
-    return s3_resource.Bucket(S3_BUCKET)
+    return get_s3_resource().Bucket(S3_BUCKET)
 
 
 def object_url(key: str) -> str:
@@ -54,6 +138,7 @@ def _guess_content_type(
     return ctype or fallback
 
 
+@timed("s3")
 def upload_fileobj_private(file_storage, *, prefix: str = "avatars/") -> dict:
     """Upload a file to S3 without ACLs (bucket must have Object Ownership enforced)."""
     if not S3_BUCKET:
@@ -63,7 +148,7 @@ def upload_fileobj_private(file_storage, *, prefix: str = "avatars/") -> dict:
     unique_key = f"{prefix}{uuid.uuid4()}-{raw_name}"
     content_type = file_storage.mimetype or _guess_content_type(raw_name)
 
-    s3_client.upload_fileobj(
+    get_s3_client().upload_fileobj(
         Fileobj=file_storage,
         Bucket=S3_BUCKET,
         Key=unique_key,
@@ -71,14 +156,153 @@ def upload_fileobj_private(file_storage, *, prefix: str = "avatars/") -> dict:
             "ContentType": content_type,
             "CacheControl": "public, max-age=31536000",
         },
+        Config=transfer_config(),
     )
     return {"key": unique_key}  # just return key; URL is presigned separately
 
 
+@timed("s3")
+def upload_fileobj_to_key(fileobj, key: str, content_type: str) -> dict:
+    """Stream a file object to a fixed key, multipart above the threshold."""
+    if not S3_BUCKET:
+        raise RuntimeError("S3_BUCKET is not set")
+
+    get_s3_client().upload_fileobj(
+        Fileobj=fileobj,
+        Bucket=S3_BUCKET,
+        Key=key,
+        ExtraArgs={
+            "ContentType": content_type,
+            "CacheControl": "public, max-age=31536000, immutable",
+        },
+        Config=transfer_config(),
+    )
+    return {"key": key}
+
+
+@timed("s3")
+def upload_bytes_private(data: bytes, key: str, content_type: str) -> dict:
+    """Upload an in-memory object under a fixed key (no ACLs)."""
+    if not S3_BUCKET:
+        raise RuntimeError("S3_BUCKET is not set")
+
+    get_s3_client().put_object(
+        Bucket=S3_BUCKET,
+        Key=key,
+        Body=data,
+        ContentType=content_type,
+        CacheControl="public, max-age=31536000, immutable",
+    )
+    return {"key": key}
+
+
+@timed("s3")
+def download_fileobj(key: str, fileobj) -> None:
+    """Download a private object; raises FileNotFoundError if it is missing"""
+    from botocore.exceptions import ClientError
+
+    if not S3_BUCKET:
+        raise RuntimeError("S3_BUCKET is not set")
+    try:
+        get_s3_client().download_fileobj(
+            S3_BUCKET, key, fileobj, Config=transfer_config()
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+            raise FileNotFoundError(key) from e
+        raise
+
+
+@timed("s3")
+def delete_object(key: str) -> None:
+    """Delete an object (a missing key is not an error)."""
+    if not S3_BUCKET:
+        raise RuntimeError("S3_BUCKET is not set")
+    get_s3_client().delete_object(Bucket=S3_BUCKET, Key=key)
+
+
+@timed("s3")
+def object_exists(key: str) -> bool:
+    """Check whether an object exists with a HEAD request."""
+    from botocore.exceptions import ClientError
+
+    if not S3_BUCKET:
+        raise RuntimeError("S3_BUCKET is not set")
+    try:
+        get_s3_client().head_object(Bucket=S3_BUCKET, Key=key)
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+            return False
+        raise
+
+
+# Per-thread signing time for _sign; None means the real clock
+_signing_clock = threading.local()
+
+
+def _install_signing_clock():
+    """Route botocore's SigV4 clock through _signing_clock (once)"""
+    import botocore.auth
+
+    real_clock = botocore.auth.get_current_datetime
+    if getattr(real_clock, "pinnable", False):
+        return
+
+    def get_current_datetime(remove_tzinfo=True):
+        pinned = getattr(_signing_clock, "now", None)
+        if pinned is None:
+            return real_clock(remove_tzinfo)
+        return pinned.replace(tzinfo=None) if remove_tzinfo else pinned
+
+    get_current_datetime.pinnable = True
+    botocore.auth.get_current_datetime = get_current_datetime
+
+
+_presign_cache = LocalCache(
+    max_entries=int(os.getenv("S3_PRESIGN_CACHE_SIZE", "4096"))
+)
+
+
+@timed("s3")
+def _sign(key: str, expires_in: int) -> str:
+    """Sign a URL as of the start of the current PRESIGN_WINDOW.
+
+    The signing time and X-Amz-Expires are the same for every request
+    (and worker) in the window, so the URL is byte-identical and can be
+    cached by browsers. It stays valid for ``expires_in`` seconds after
+    the window ends, i.e. at least ``expires_in`` from any moment in it.
+    """
+    client = get_s3_client()
+    now = int(time.time())  # signers work in whole seconds
+    window = max(PRESIGN_WINDOW, 1)
+    window_start = now - now % window
+    _signing_clock.now = datetime.fromtimestamp(window_start, timezone.utc)
+    try:
+        url = client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": S3_BUCKET, "Key": key},
+            ExpiresIn=window + expires_in,
+        )
+    finally:
+        _signing_clock.now = None
+    _presign_cache.set((key, expires_in), url, ttl=window_start + window - now)
+    return url
+
+
 def presigned_get_url(key: str, expires_in: int = 3600) -> str:
     """Generate a temporary URL to access a private S3 object."""
-    return s3_client.generate_presigned_url(
-        "get_object",
-        Params={"Bucket": S3_BUCKET, "Key": key},
-        ExpiresIn=expires_in,
-    )
+    url = _presign_cache.get((key, expires_in))
+    cache_stats.record("presigned_url", hit=url is not None)
+    return url or _sign(key, expires_in)
+
+
+def presign_many(keys, expires_in: int = 3600) -> dict:
+    """Presign several keys at once for list serializers.
+
+    Duplicate and empty keys are skipped; returns {key: url}.
+    """
+    urls = {}
+    for key in dict.fromkeys(k for k in keys if k):
+        urls[key] = presigned_get_url(key, expires_in)
+    return urls
@@ -0,0 +1,34 @@
+from flask import current_app
+from .backends import LocalCache, RedisCache, make_backend
+from .stats import cache_stats
+
+
+def init_app(app):
+    """Attach the configured cache backend to the app"""
+    app.extensions["cache"] = make_backend(app.config)
+
+
+def get_cache():
+    """Returns the cache backend of the current app"""
+    return current_app.extensions["cache"]
+
+
+def cache_is_shared(app=None):
+    """Whether the cache is visible to every worker process.
+
+    The local cache lives in one process: what one worker stores or
+    deletes there, the others never see.
+    """
+    app = app or current_app
+    return not isinstance(app.extensions["cache"], LocalCache)
+
+
+__all__ = [
+    "LocalCache",
+    "RedisCache",
+    "cache_is_shared",
+    "cache_stats",
+    "get_cache",
+    "init_app",
+    "make_backend",
+]
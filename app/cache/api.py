@@ -0,0 +1,12 @@
+from flask import Blueprint, abort, current_app, jsonify
+from .stats import cache_stats
+
+cache_api = Blueprint("cache_api", __name__, url_prefix="/api/cache")
+
+
+@cache_api.route("/stats", methods=["GET"])
+def stats():
+    """Hit ratio of every cache, per endpoint (this worker only)"""
+    if not current_app.config.get("CACHE_STATS_ENABLED"):
+        abort(404)
+    return jsonify({"caches": cache_stats.snapshot()}), 200
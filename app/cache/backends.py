@@ -0,0 +1,90 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class LocalCache:
+    """Bounded in-process LRU cache with a per-entry TTL.
+
+    Values are returned as stored, so callers must treat them as read-only.
+    """
+
+    def __init__(self, max_entries=1024, default_ttl=300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache:
+    """Cache shared between workers, stored in Redis as JSON"""
+
+    def __init__(self, url, prefix="matrix:", default_ttl=300):
+        import redis  # optional dependency, only needed for this backend
+
+        self._redis = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+
+    def get(self, key):
+        raw = self._redis.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=None):
+        self._redis.set(
+            self.prefix + key, json.dumps(value), ex=ttl or self.default_ttl
+        )
+
+    def delete(self, *keys):
+        if keys:
+            self._redis.delete(*(self.prefix + key for key in keys))
+
+    def clear(self):
+        for key in self._redis.scan_iter(match=self.prefix + "*"):
+            self._redis.delete(key)
+
+
+def make_backend(config):
+    """Build the cache backend selected by ``CACHE_BACKEND``"""
+    backend = config.get("CACHE_BACKEND", "local")
+    ttl = config.get("CACHE_DEFAULT_TTL", 300)
+    if backend == "local":
+        return LocalCache(
+            max_entries=config.get("CACHE_MAX_ENTRIES", 1024), default_ttl=ttl
+        )
+    if backend == "redis":
+        url = config.get("CACHE_REDIS_URL")
+        if not url:
+            raise RuntimeError("CACHE_REDIS_URL is not set")
+        return RedisCache(url, default_ttl=ttl)
+    raise RuntimeError(f"Unknown CACHE_BACKEND: {backend}")
@@ -0,0 +1,38 @@
+import threading
+from collections import defaultdict
+from flask import has_request_context, request
+
+
+class CacheStats:
+    """Hit/miss counters per cache and per Flask endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(lambda: [0, 0])
+
+    def record(self, cache_name, hit):
+        endpoint = request.endpoint if has_request_context() else None
+        with self._lock:
+            self._counts[(cache_name, endpoint or "-")][0 if hit else 1] += 1
+
+    def snapshot(self):
+        """Returns {cache: {endpoint: {hits, misses, hit_ratio}}}"""
+        with self._lock:
+            counts = {key: list(value) for key, value in self._counts.items()}
+
+        report = defaultdict(dict)
+        for (cache_name, endpoint), (hits, misses) in sorted(counts.items()):
+            total = hits + misses
+            report[cache_name][endpoint] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / total, 4) if total else 0.0,
+            }
+        return dict(report)
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+cache_stats = CacheStats()
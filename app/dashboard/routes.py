@@ -1,7 +1,9 @@
 from . import dashboard  # Import blueprint from __init__.py
 from .dashboard import handle_dashboard
+from app.database import use_read_replica
 
 
 @dashboard.route("/dashboard")
+@use_read_replica
 def show_dashboard():
     return handle_dashboard()
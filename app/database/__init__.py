@@ -0,0 +1,41 @@
+from flask import current_app
+from .pool import PoolStats
+from .routing import RoutingSession, init_replicas, use_read_replica
+from . import slow_queries
+
+
+def init_app(app):
+    """Attach pool statistics and the slow query log, register replicas"""
+    # Imported here: app.extensions builds db with RoutingSession
+    from app.extensions import db
+
+    with app.app_context():
+        engines = dict(db.engines)
+    app.extensions["pool_stats"] = {
+        key or "default": PoolStats(engine) for key, engine in engines.items()
+    }
+    init_replicas(app, engines)
+    slow_queries.init_app(app, engines)
+
+
+def pool_stats():
+    """Returns {bind: pool statistics} for this worker"""
+    return {
+        key: stats.snapshot()
+        for key, stats in current_app.extensions["pool_stats"].items()
+    }
+
+
+def replica_lag():
+    """Last measured lag in seconds per replica bind"""
+    return current_app.extensions["db_replicas"].snapshot()
+
+
+__all__ = [
+    "PoolStats",
+    "RoutingSession",
+    "init_app",
+    "pool_stats",
+    "replica_lag",
+    "use_read_replica",
+]
@@ -0,0 +1,14 @@
+from flask import Blueprint, abort, current_app, jsonify
+from . import pool_stats, replica_lag
+
+database_api = Blueprint("database_api", __name__, url_prefix="/api/database")
+
+
+@database_api.route("/pool", methods=["GET"])
+def pool():
+    """Live connection pool checkout statistics (this worker only)"""
+    if not current_app.config.get("DB_POOL_STATS_ENABLED"):
+        abort(404)
+    return jsonify(
+        {"engines": pool_stats(), "replica_lag": replica_lag()}
+    ), 200
@@ -0,0 +1,50 @@
+import threading
+from collections import Counter
+from sqlalchemy import event
+
+# Pool events counted per engine
+POOL_EVENTS = (
+    "connect",
+    "checkout",
+    "checkin",
+    "invalidate",
+    "soft_invalidate",
+)
+
+
+class PoolStats:
+    """Checkout counters and high-water mark of one engine's pool"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._max_checked_out = 0
+        for name in POOL_EVENTS:
+            event.listen(engine, name, self._counter(name))
+
+    def _counter(self, name):
+        def record(*_args):
+            with self._lock:
+                self._counts[name] += 1
+                if name == "checkout":
+                    self._max_checked_out = max(
+                        self._max_checked_out,
+                        self._counts["checkout"] - self._counts["checkin"],
+                    )
+
+        return record
+
+    def snapshot(self):
+        pool = self.engine.pool
+        with self._lock:
+            report = {name: self._counts[name] for name in POOL_EVENTS}
+            report["max_checked_out"] = self._max_checked_out
+        report["pool"] = type(pool).__name__
+        report["status"] = pool.status()
+        # QueuePool only; SQLite's single-connection pools lack these
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if method is not None:
+                report[name] = method()
+        return report
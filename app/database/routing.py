@@ -0,0 +1,129 @@
+import logging
+import random
+import threading
+import time
+from functools import wraps
+from flask import current_app, g, has_request_context, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+
+logger = logging.getLogger(__name__)
+
+REPLICA_PREFIX = "replica_"
+_RYW_KEY = "_db_primary_until"
+
+# Seconds a PostgreSQL standby is behind; 0 once it has replayed all WAL
+# it received (an idle primary would otherwise look like growing lag)
+_PG_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()"
+    " THEN 0 ELSE COALESCE(EXTRACT(EPOCH FROM"
+    " now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaMonitor:
+    """Tracks replica lag, re-checking each replica at most every interval"""
+
+    def __init__(self, engines, max_lag, interval):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._lags = {}  # key -> (checked_at, lag seconds)
+
+    def _measure(self, engine):
+        if engine.dialect.name != "postgresql":
+            return 0.0  # no replication to measure (e.g. local SQLite pairs)
+        try:
+            with engine.connect() as conn:
+                return float(conn.execute(_PG_LAG).scalar() or 0)
+        except Exception:
+            logger.warning("Replica lag check failed", exc_info=True)
+            return float("inf")
+
+    def lag(self, key):
+        now = time.monotonic()
+        with self._lock:
+            checked = self._lags.get(key)
+            if checked is not None and now - checked[0] < self.interval:
+                return checked[1]
+        lag = self._measure(self.engines[key])
+        with self._lock:
+            self._lags[key] = (now, lag)
+        return lag
+
+    def healthy(self):
+        """Keys of replicas whose lag is within max_lag"""
+        return [key for key in self.engines if self.lag(key) <= self.max_lag]
+
+    def snapshot(self):
+        with self._lock:
+            return {key: lag for key, (_, lag) in self._lags.items()}
+
+
+def init_replicas(app, engines):
+    """Register the replica binds (SQLALCHEMY_BINDS "replica_*")"""
+    replicas = {
+        key: engine
+        for key, engine in engines.items()
+        if key and key.startswith(REPLICA_PREFIX)
+    }
+    app.extensions["db_replicas"] = ReplicaMonitor(
+        replicas,
+        max_lag=app.config.get("DATABASE_REPLICA_MAX_LAG", 5),
+        interval=app.config.get("DATABASE_REPLICA_LAG_CHECK_INTERVAL", 5),
+    )
+
+
+def use_read_replica(view):
+    """Route the reads of a view to a replica when one is fresh enough"""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_use_replica = True
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def _replica_engine():
+    """The replica for this request, or None to stay on the primary"""
+    if not has_request_context() or not g.get("db_use_replica"):
+        return None
+    if "db_replica" not in g:
+        monitor = current_app.extensions.get("db_replicas")
+        key = None
+        # Read-your-own-writes: a request that wrote, or a client that
+        # wrote recently, keeps reading from the primary
+        recently_wrote = session.get(_RYW_KEY, 0) > time.time()
+        if monitor and monitor.engines and not recently_wrote:
+            healthy = monitor.healthy()
+            key = random.choice(healthy) if healthy else None
+        g.db_replica = monitor.engines[key] if key else None
+    return g.db_replica
+
+
+class RoutingSession(Session):
+    """Session that sends reads of replica-enabled views to a replica.
+
+    Flushes, and every statement after the first flush of a request, go
+    to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper, clause, bind=bind, **kwargs)
+        if bind is None and not self._flushing:
+            replica = _replica_engine()
+            if replica is not None and engine is self._db.engine:
+                return replica
+        return engine
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _stick_to_primary(_session, _flush_context):
+    if not has_request_context():
+        return
+    g.db_replica = None
+    window = current_app.config.get("DATABASE_READ_YOUR_WRITES_SECONDS", 10)
+    if window:
+        session[_RYW_KEY] = time.time() + window
@@ -0,0 +1,382 @@
+import bisect
+import csv
+import io
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, insert, select, text
+from werkzeug.security import generate_password_hash
+from app.extensions import db
+from app.auth.models import User
+from app.profile.models import SKILL_LEVELS, Skill, UserSkill, level_rank_for
+from app.profile.profile_database_manager import ProfileDatabaseManager
+from app.projects.models import (
+    Application,
+    ChatMessage,
+    Project,
+    ProjectLink,
+    ProjectNote,
+    Task,
+)
+
+# Same choices as the project and profile forms
+SECTORS = ("web", "ai", "embedded")
+PROJECT_SKILLS = ("C", "C++", "C#", "Python", "Java", "Other")
+USER_SKILLS = (
+    "Python",
+    "C",
+    "C++",
+    "JavaScript",
+    "TypeScript",
+    "Julia",
+    "Rust",
+    "Go",
+    "Java",
+    "HTML",
+    "CSS",
+    "Flask",
+    "React",
+    "Node.js",
+    "NumPy",
+    "pandas",
+    "PyTorch",
+    "TensorFlow",
+    "SQL",
+    "Git",
+    "Docker",
+    "Linux",
+    "AWS",
+)
+WORDS = (
+    "build",
+    "sensor",
+    "model",
+    "api",
+    "dashboard",
+    "robot",
+    "game",
+    "data",
+    "cloud",
+    "open",
+    "source",
+    "tool",
+    "mobile",
+    "fast",
+    "secure",
+    "smart",
+    "learning",
+    "network",
+    "firmware",
+    "design",
+    "team",
+    "prototype",
+)
+SEED_PASSWORD = "password"
+# Generated timestamps fall in the year before this instant (naive UTC, as
+# the models store them), so a seed yields the same rows on any day
+SEED_EPOCH = datetime(2025, 1, 1)
+
+
+class Zipf:
+    """Draws indexes 0..n-1 with probability proportional to 1/(i+1)^s"""
+
+    def __init__(self, rng, n, s=1.1):
+        self.rng = rng
+        self.cum = list(
+            itertools.accumulate(1 / (i + 1) ** s for i in range(n))
+        )
+
+    def __call__(self):
+        return bisect.bisect(self.cum, self.rng.random() * self.cum[-1])
+
+
+def _heavy_tail(rng, mean, alpha, cap):
+    """Pareto-distributed count with roughly the given mean"""
+    if mean <= 0:
+        return 0
+    return min(cap, int(mean * (alpha - 1) / alpha * rng.paretovariate(alpha)))
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+class _Writer:
+    """Bulk-loads rows: COPY on psycopg2, executemany elsewhere"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.copy = connection.dialect.driver == "psycopg2"
+        self.counts = {}
+
+    def write(self, model, rows):
+        if not rows:
+            return
+        table = model.__table__
+        if self.copy:
+            columns = list(rows[0])
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow(
+                    [r"\N" if row[c] is None else row[c] for c in columns]
+                )
+            buffer.seek(0)
+            cursor = self.connection.connection.cursor()
+            cursor.copy_expert(
+                f'COPY "{table.name}" ({", ".join(columns)}) FROM STDIN '
+                r"WITH (FORMAT csv, NULL '\N')",
+                buffer,
+            )
+        else:
+            self.connection.execute(insert(table), rows)
+        self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+
+
+def _next_id(connection, model):
+    return (connection.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _reset_sequences(connection, models):
+    if connection.dialect.name != "postgresql":
+        return
+    for model in models:
+        table = model.__table__.name
+        connection.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+                f'(SELECT COALESCE(MAX(id), 1) FROM "{table}"))'
+            )
+        )
+
+
+@click.command("seed")
+@click.option("--users", default=1000, show_default=True)
+@click.option(
+    "--projects",
+    type=int,
+    default=None,
+    help="Number of projects [default: 2 per user]",
+)
+@click.option(
+    "--applications",
+    default=3.0,
+    show_default=True,
+    help="Mean applications per project (heavy-tailed).",
+)
+@click.option(
+    "--tasks", default=4.0, show_default=True, help="Mean tasks per project."
+)
+@click.option(
+    "--messages",
+    default=10.0,
+    show_default=True,
+    help="Mean chat messages per project (long tail).",
+)
+@click.option(
+    "--seed",
+    "seed_value",
+    default=42,
+    show_default=True,
+    help="Random seed; the same seed yields the same dataset.",
+)
+@click.option(
+    "--batch-size",
+    default=5000,
+    show_default=True,
+    help="Projects generated and committed per batch.",
+)
+@with_appcontext
+def seed(
+    users, projects, applications, tasks, messages, seed_value, batch_size
+):
+    """Generate a synthetic dataset for load testing.
+
+    Popularity is power-law: a few users create most projects and a few
+    projects get most applications and chat. Every seeded user has the
+    password "password". Rows are appended to the existing data; usernames
+    depend only on the seed, so load each seed into a database once. On an
+    empty database the same seed always yields the same rows and ids.
+    """
+    rng = random.Random(seed_value)
+    projects = projects if projects is not None else users * 2
+    started = time.perf_counter()
+
+    # Hashing once keeps a million users from taking hours
+    pwhash = generate_password_hash(SEED_PASSWORD)
+    skill_ids = ProfileDatabaseManager.ensure_skills(USER_SKILLS)
+    db.session.commit()
+    skill_ids = [skill_ids[name.lower()] for name in USER_SKILLS]
+
+    tag = f"s{seed_value}"
+    taken = db.session.scalar(
+        select(User.id).where(User.username == f"{tag}_user0")
+    )
+    if users and taken is not None:
+        raise click.UsageError(
+            f"Seed {seed_value} is already loaded; pick another --seed"
+        )
+
+    with db.engine.connect() as connection:
+        writer = _Writer(connection)
+        first_user = _next_id(connection, User)
+
+        for offset in range(0, users, batch_size):
+            user_rows, skill_rows = [], []
+            for i in range(offset, min(offset + batch_size, users)):
+                user_id = first_user + i
+                user_rows.append(
+                    {
+                        "id": user_id,
+                        "username": f"{tag}_user{i}",
+                        "email": f"{tag}_user{i}@example.com",
+                        "password": pwhash,
+                        "bio": _sentence(rng, rng.randint(3, 12)),
+                        "contact_info": None,
+                    }
+                )
+                picked = rng.sample(skill_ids, rng.randint(0, 5))
+                for skill_id in picked:
+                    level = rng.choice(SKILL_LEVELS)
+                    skill_rows.append(
+                        {
+                            "user_id": user_id,
+                            "skill_id": skill_id,
+                            "level": level,
+                            "level_rank": level_rank_for(level),
+                            "years": rng.randint(0, 15),
+                        }
+                    )
+            writer.write(User, user_rows)
+            writer.write(UserSkill, skill_rows)
+            connection.commit()
+
+        user_ids = range(first_user, first_user + users)
+        # Rank order is shuffled so popular users are not just low ids
+        ranked_users = rng.sample(user_ids, len(user_ids)) if users else []
+        pick_user = Zipf(rng, len(ranked_users)) if users else None
+        first_project = _next_id(connection, Project)
+
+        for offset in range(0, projects if users else 0, batch_size):
+            batch = {
+                model: []
+                for model in (
+                    Project,
+                    Application,
+                    Task,
+                    ChatMessage,
+                    ProjectNote,
+                    ProjectLink,
+                )
+            }
+            for i in range(offset, min(offset + batch_size, projects)):
+                project_id = first_project + i
+                created = SEED_EPOCH - timedelta(
+                    minutes=rng.randint(0, 525600)
+                )
+                skills = rng.sample(PROJECT_SKILLS, rng.randint(1, 3))
+                creator = ranked_users[pick_user()]
+                batch[Project].append(
+                    {
+                        "id": project_id,
+                        "name": _sentence(rng, rng.randint(1, 4)),
+                        "description": _sentence(rng, rng.randint(8, 40)),
+                        "sector": rng.choice(SECTORS),
+                        "people_count": rng.randint(1, 16),
+                        "skills": ",".join(skills),
+                        "creator_id": creator,
+                    }
+                )
+
+                for _ in range(_heavy_tail(rng, applications, 2.0, 500)):
+                    batch[Application].append(
+                        {
+                            "project_id": project_id,
+                            "applicant_id": ranked_users[pick_user()],
+                            "information": _sentence(rng, rng.randint(5, 20)),
+                            "skills": ", ".join(rng.sample(skills, 1)),
+                            "contact_info": None,
+                            "created_at": created
+                            + timedelta(hours=rng.randint(1, 2000)),
+                        }
+                    )
+
+                for n in range(_heavy_tail(rng, tasks, 3.0, 100)):
+                    batch[Task].append(
+                        {
+                            "project_id": project_id,
+                            "title": _sentence(rng, rng.randint(2, 6)),
+                            "is_done": rng.random() < 0.4,
+                            "assignee_id": creator if n % 2 else None,
+                        }
+                    )
+
+                # Long chat histories on a few busy projects
+                posted = created
+                for _ in range(_heavy_tail(rng, messages, 1.5, 5000)):
+                    posted += timedelta(minutes=rng.randint(1, 600))
+                    batch[ChatMessage].append(
+                        {
+                            "project_id": project_id,
+                            "author_id": rng.choice(
+                                (creator, ranked_users[pick_user()])
+                            ),
+                            "body": _sentence(rng, rng.randint(1, 25)),
+                            "created_at": posted,
+                        }
+                    )
+
+                if rng.random() < 0.3:
+                    batch[ProjectNote].append(
+                        {
+                            "project_id": project_id,
+                            "author_id": creator,
+                            "title": None,
+                            "content": _sentence(rng, rng.randint(5, 60)),
+                            "created_at": created,
+                            "updated_at": None,
+                        }
+                    )
+                for _ in range(rng.randint(0, 2)):
+                    batch[ProjectLink].append(
+                        {
+                            "project_id": project_id,
+                            "label": rng.choice(("Repo", "Docs", "Demo")),
+                            "url": f"https://example.com/{tag}/{project_id}",
+                        }
+                    )
+
+            for model, rows in batch.items():
+                writer.write(model, rows)
+            connection.commit()
+            click.echo(
+                f"{min(offset + batch_size, projects)}/{projects} projects, "
+                f"{time.perf_counter() - started:.1f}s"
+            )
+
+        _reset_sequences(
+            connection,
+            (
+                User,
+                UserSkill,
+                Project,
+                Application,
+                Task,
+                ChatMessage,
+                ProjectNote,
+                ProjectLink,
+                Skill,
+            ),
+        )
+        connection.commit()
+
+    elapsed = time.perf_counter() - started
+    total = sum(writer.counts.values())
+    for table, count in sorted(writer.counts.items()):
+        click.echo(f"  {table}: {count}")
+    click.echo(
+        f"Seeded {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)"
+    )
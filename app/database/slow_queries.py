@@ -0,0 +1,338 @@
+import glob
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+import time
+import traceback
+from collections import defaultdict
+from datetime import datetime, timezone
+import click
+from flask import current_app, has_request_context, request
+from flask.cli import AppGroup
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import NullPool
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_ROOT = os.path.dirname(APP_ROOT)
+
+logger = logging.getLogger("app.slow_queries")
+
+# Seconds an EXPLAIN may spend connecting (and, on PostgreSQL, running)
+EXPLAIN_TIMEOUT = 2
+
+# Records waiting for a plan; past this they are logged without one
+EXPLAIN_QUEUE_SIZE = 100
+
+
+def redact(value):
+    """Keep numbers, booleans and NULLs; describe everything else"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [redact(v) for v in value]
+    if isinstance(value, dict):
+        return {k: redact(v) for k, v in value.items()}
+    size = len(value) if hasattr(value, "__len__") else None
+    kind = type(value).__name__
+    return f"<{kind} len={size}>" if size is not None else f"<{kind}>"
+
+
+def _origin():
+    """Innermost app frame that issued the query, as path:line in func"""
+    here = os.path.abspath(__file__)
+    for frame in reversed(traceback.extract_stack()):
+        path = os.path.abspath(frame.filename)
+        if path.startswith(APP_ROOT) and path != here:
+            relative = os.path.relpath(path, PROJECT_ROOT)
+            return f"{relative}:{frame.lineno} in {frame.name}"
+    return None
+
+
+class SlowQueryLog:
+    """Logs statements slower than ``threshold_ms`` on the given engines.
+
+    Each record is one JSON line with the statement, redacted parameters,
+    the Flask endpoint and the app frame that ran it. With ``explain`` a
+    SELECT's plan is captured (plain EXPLAIN, never ANALYZE) at most once
+    per statement every ``explain_interval`` seconds, over an unpooled
+    connection so it never competes with requests for the app's pool.
+    Plans are taken by a background thread, never by the slow request
+    itself; when that thread falls behind, records are logged without one.
+    """
+
+    def __init__(
+        self, engines, threshold_ms, explain=False, explain_interval=60
+    ):
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self.explain_interval = explain_interval
+        self._explained = {}  # statement -> time of its last EXPLAIN
+        self._explain_engines = {}  # app engine -> NullPool twin
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._queue = None  # per process, see _start_explainer
+        self._explainer_pid = None
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._before)
+            event.listen(engine, "after_cursor_execute", self._after)
+            event.listen(engine, "handle_error", self._failed)
+
+    def _before(self, conn, _cursor, _statement, _parameters, _context, _many):
+        conn.info.setdefault("slow_query_start", []).append(
+            time.perf_counter()
+        )
+
+    def _failed(self, context):
+        started = context.connection and context.connection.info.get(
+            "slow_query_start"
+        )
+        if started:
+            started.pop()
+
+    def _after(self, conn, _cursor, statement, parameters, _context, many):
+        started = conn.info.get("slow_query_start")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        # The EXPLAIN issued below goes through these hooks too
+        if elapsed < self.threshold or getattr(self._local, "busy", False):
+            return
+        self._local.busy = True
+        try:
+            self.record(conn, statement, parameters, many, elapsed)
+        except Exception:
+            logging.getLogger(__name__).warning(
+                "Could not log slow query", exc_info=True
+            )
+        finally:
+            self._local.busy = False
+
+    def record(self, conn, statement, parameters, many, elapsed):
+        entry = {
+            "ts": datetime.now(timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "duration_ms": round(elapsed * 1000, 2),
+            "statement": " ".join(statement.split()),
+            "parameters": redact(parameters[0] if many else parameters),
+            "executemany": len(parameters) if many else None,
+            "endpoint": request.endpoint if has_request_context() else None,
+            "path": request.path if has_request_context() else None,
+            "origin": _origin(),
+            "database": conn.engine.url.render_as_string(hide_password=True),
+        }
+        if self.explain and not many and self._should_explain(statement):
+            self._start_explainer()
+            try:
+                self._queue.put_nowait(
+                    (entry, conn.engine, statement, parameters)
+                )
+                return
+            except queue.Full:
+                with self._lock:
+                    self._explained.pop(statement, None)
+        logger.warning(json.dumps(entry, default=str))
+
+    def _start_explainer(self):
+        # A thread started before a fork does not run in the child
+        if self._explainer_pid == os.getpid():
+            return
+        with self._lock:
+            if self._explainer_pid != os.getpid():
+                self._queue = queue.Queue(EXPLAIN_QUEUE_SIZE)
+                threading.Thread(
+                    target=self._explain_loop,
+                    args=(self._queue,),
+                    name="slow-query-explain",
+                    daemon=True,
+                ).start()
+                self._explainer_pid = os.getpid()
+
+    def _explain_loop(self, pending):
+        while True:
+            entry, engine, statement, parameters = pending.get()
+            try:
+                entry["plan"] = self._plan(engine, statement, parameters)
+                logger.warning(json.dumps(entry, default=str))
+            except Exception:
+                logging.getLogger(__name__).warning(
+                    "Could not log slow query", exc_info=True
+                )
+            finally:
+                pending.task_done()
+
+    def _should_explain(self, statement):
+        keyword = (statement.lstrip().split(None, 1) or [""])[0].upper()
+        if keyword not in ("SELECT", "WITH"):
+            return False
+        now = time.monotonic()
+        with self._lock:
+            last = self._explained.get(statement)
+            if last is not None and now - last < self.explain_interval:
+                return False
+            if len(self._explained) > 1000:
+                self._explained.clear()
+            self._explained[statement] = now
+        return True
+
+    def _explain_engine(self, engine):
+        with self._lock:
+            twin = self._explain_engines.get(engine)
+            if twin is None:
+                if engine.dialect.name == "postgresql":
+                    connect_args = {
+                        "connect_timeout": EXPLAIN_TIMEOUT,
+                        "options": "-c statement_timeout="
+                        f"{EXPLAIN_TIMEOUT * 1000}",
+                    }
+                elif engine.dialect.name == "sqlite":
+                    connect_args = {"timeout": EXPLAIN_TIMEOUT}
+                else:
+                    connect_args = {}
+                twin = self._explain_engines[engine] = create_engine(
+                    engine.url, poolclass=NullPool, connect_args=connect_args
+                )
+            return twin
+
+    def _plan(self, engine, statement, parameters):
+        if engine.dialect.name == "postgresql":
+            prefix = "EXPLAIN (ANALYZE off, FORMAT TEXT) "
+        elif engine.dialect.name == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        else:
+            prefix = "EXPLAIN "
+        try:
+            with self._explain_engine(engine).connect() as conn:
+                rows = conn.exec_driver_sql(prefix + statement, parameters)
+                return [" ".join(str(col) for col in row) for row in rows]
+        except Exception as e:
+            return [f"EXPLAIN failed: {e}"]
+
+
+def init_app(app, engines):
+    """Start the slow query log when SLOW_QUERY_MS is above 0"""
+    threshold = app.config.get("SLOW_QUERY_MS", 0)
+    if not threshold:
+        return
+    path = app.config["SLOW_QUERY_LOG"]
+    if not any(
+        getattr(h, "baseFilename", None) == os.path.abspath(path)
+        for h in logger.handlers
+    ):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Every worker appends to the same file, so none of them may
+        # rotate it: logrotate (or similar) moves it aside and each worker
+        # reopens the path on its next record
+        handler = logging.handlers.WatchedFileHandler(path, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.WARNING)
+        logger.propagate = False
+    app.extensions["slow_query_log"] = SlowQueryLog(
+        engines.values(),
+        threshold,
+        explain=app.config.get("SLOW_QUERY_EXPLAIN", False),
+        explain_interval=app.config.get("SLOW_QUERY_EXPLAIN_INTERVAL", 60),
+    )
+
+
+# Expanded IN lists of any length are the same query
+_PARAM = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_IN_LIST = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})+\s*\)")
+
+
+def fingerprint(statement):
+    return _IN_LIST.sub("(...)", statement)
+
+
+def read_entries(path):
+    """Records of the log and its rotated backups, oldest first"""
+    backups = sorted(
+        (p for p in glob.glob(f"{glob.escape(path)}.*") if p[-1].isdigit()),
+        key=lambda p: int(p.rsplit(".", 1)[1]),
+        reverse=True,
+    )
+    for name in backups + [path]:
+        try:
+            fh = open(name, encoding="utf-8")
+        except FileNotFoundError:
+            continue
+        with fh:
+            for line in fh:
+                try:
+                    yield json.loads(line)
+                except ValueError:  # a line cut short by rotation
+                    continue
+
+
+slow_queries_cli = AppGroup("slow-queries", help="Inspect the slow query log.")
+
+
+@slow_queries_cli.command("top")
+@click.option("--limit", default=10, show_default=True)
+@click.option(
+    "--by",
+    type=click.Choice(("total", "count", "max", "mean")),
+    default="total",
+    show_default=True,
+    help="Rank statements by total, count, max or mean duration.",
+)
+@click.option(
+    "--log",
+    "path",
+    type=click.Path(dir_okay=False),
+    help="Log file [default: SLOW_QUERY_LOG]",
+)
+@click.option("--endpoint", help="Only queries issued by this endpoint.")
+def top(limit, by, path, endpoint):
+    """Summarise the slowest statements, grouped by query shape."""
+    path = path or current_app.config["SLOW_QUERY_LOG"]
+    groups = defaultdict(
+        lambda: {
+            "count": 0,
+            "total": 0.0,
+            "max": 0.0,
+            "endpoints": defaultdict(int),
+            "origins": defaultdict(int),
+            "plan": None,
+        }
+    )
+    for entry in read_entries(path):
+        if endpoint and entry.get("endpoint") != endpoint:
+            continue
+        group = groups[fingerprint(entry["statement"])]
+        group["count"] += 1
+        group["total"] += entry["duration_ms"]
+        group["max"] = max(group["max"], entry["duration_ms"])
+        group["endpoints"][entry.get("endpoint") or "-"] += 1
+        group["origins"][entry.get("origin") or "-"] += 1
+        group["plan"] = entry.get("plan") or group["plan"]
+
+    if not groups:
+        click.echo(f"No slow queries logged in {path}")
+        return
+    for group in groups.values():
+        group["mean"] = group["total"] / group["count"]
+    ranked = sorted(groups.items(), key=lambda item: item[1][by], reverse=True)
+
+    for rank, (statement, group) in enumerate(ranked[:limit], 1):
+        click.echo(
+            f"#{rank}  {group['count']}x  total {group['total']:.0f} ms  "
+            f"mean {group['mean']:.1f} ms  max {group['max']:.1f} ms"
+        )
+        click.echo(f"    {statement[:300]}")
+        for label, counts in (
+            ("endpoint", group["endpoints"]),
+            ("origin", group["origins"]),
+        ):
+            common = sorted(counts.items(), key=lambda kv: -kv[1])[:3]
+            click.echo(
+                f"    {label}: " + ", ".join(f"{k} ({n})" for k, n in common)
+            )
+        for line in (group["plan"] or [])[:10]:
+            click.echo(f"    | {line}")
+        click.echo()
@@ -1,6 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from app.database.routing import RoutingSession
 
-db = SQLAlchemy()
+# Reads of views marked @use_read_replica may go to a replica bind
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 login_manager = LoginManager()
 login_manager.login_view = "auth.login"
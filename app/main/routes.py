@@ -1,10 +1,12 @@
 from flask import render_template
 from app.projects.models import Project
 from flask_login import current_user
+from app.database import use_read_replica
 from . import main
 
 
 @main.route("/")
+@use_read_replica
 def home():
     projects = Project.query.order_by(Project.id.desc()).all()
     return render_template(
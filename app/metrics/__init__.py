@@ -0,0 +1,162 @@
+import os
+import time
+from flask import current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.cache import cache_stats
+from . import exposition
+from .registry import DEFAULT_BUCKETS, SQL_BUCKETS, Registry, registry
+
+
+def record_call(service, operation, seconds, failed=False):
+    """Latency (and failure) of one call to an outside service, e.g. S3"""
+    labels = (("operation", operation),)
+    registry.observe(f"{service}_request_duration_seconds", labels, seconds)
+    if failed:
+        registry.inc(f"{service}_errors_total", labels)
+
+
+def _before_request():
+    g.metrics_started = time.perf_counter()
+
+
+def _after_request(response):
+    started = g.pop("metrics_started", None)
+    if started is not None:
+        registry.observe(
+            "http_request_duration_seconds",
+            (
+                ("endpoint", request.endpoint or "-"),
+                ("method", request.method),
+                ("status", str(response.status_code)),
+            ),
+            time.perf_counter() - started,
+        )
+    _maybe_publish(current_app._get_current_object())
+    return response
+
+
+def _before_execute(conn, _cursor, _statement, _parameters, _context, _many):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_execute(conn, _cursor, statement, _parameters, _context, _many):
+    started = conn.info.get("metrics_query_start")
+    if started:
+        operation = (statement.lstrip().split(None, 1) or ["other"])[0].lower()
+        if operation not in ("select", "insert", "update", "delete"):
+            operation = "other"
+        registry.observe(
+            "db_statement_duration_seconds",
+            (("operation", operation),),
+            time.perf_counter() - started.pop(),
+            SQL_BUCKETS,
+        )
+
+
+def _failed_execute(context):
+    started = context.connection and context.connection.info.get(
+        "metrics_query_start"
+    )
+    if started:
+        started.pop()
+
+
+def _pool_metrics():
+    """Pool counters and gauges of this worker from app.database"""
+    from app.database import pool_stats
+
+    counters, gauges = {}, []
+    for bind, stats in pool_stats().items():
+        labels = (("bind", bind),)
+        counters[("db_pool_connections_total", labels)] = stats["connect"]
+        counters[("db_pool_checkouts_total", labels)] = stats["checkout"]
+        if "checkedout" in stats:
+            gauges.append(("db_pool_checked_out", labels, stats["checkedout"]))
+        if "overflow" in stats:
+            # Negative while the pool has not opened pool_size connections
+            gauges.append(
+                ("db_pool_overflow", labels, max(0, stats["overflow"]))
+            )
+    return counters, gauges
+
+
+def _cache_counters():
+    counters = {}
+    for cache_name, endpoints in cache_stats.snapshot().items():
+        for field, result in (("hits", "hit"), ("misses", "miss")):
+            labels = (("cache", cache_name), ("result", result))
+            counters[("cache_requests_total", labels)] = sum(
+                counts[field] for counts in endpoints.values()
+            )
+    return counters
+
+
+def collect():
+    """Snapshot of this worker: recorded metrics plus pool and cache stats"""
+    merged = registry.collect()
+    pool_counters, gauges = _pool_metrics()
+    merged["counters"].update(pool_counters)
+    merged["counters"].update(_cache_counters())
+    return exposition.snapshot(merged, gauges, dict(registry.buckets))
+
+
+def _maybe_publish(app, force=False):
+    directory = app.config.get("METRICS_MULTIPROC_DIR")
+    if not directory:
+        return
+    now = time.monotonic()
+    state = app.extensions["metrics"]
+    if (
+        force
+        or now - state["published"] >= app.config["METRICS_FLUSH_INTERVAL"]
+    ):
+        state["published"] = now
+        exposition.write_snapshot(directory, collect())
+
+
+def render_metrics():
+    """Metrics of every worker (or just this one) in Prometheus text format"""
+    app = current_app._get_current_object()
+    directory = app.config.get("METRICS_MULTIPROC_DIR")
+    if directory:
+        _maybe_publish(app, force=True)
+        snapshots = exposition.read_snapshots(directory)
+    else:
+        snapshots = [(exposition.worker_id(), collect())]
+    return exposition.render(*exposition.combine(snapshots))
+
+
+def init_app(app):
+    """Start recording request, SQL, S3 and cache metrics (METRICS_ENABLED).
+
+    With several worker processes set METRICS_MULTIPROC_DIR to a directory
+    shared by the workers: each worker publishes its numbers there at most
+    every METRICS_FLUSH_INTERVAL seconds (and when it serves a scrape), and
+    /metrics adds them up. Exited workers' counters are folded into a
+    persistent aggregate, so totals only reset if the directory is cleared.
+    """
+    if not app.config.get("METRICS_ENABLED"):
+        return
+    app.extensions["metrics"] = {"published": float("-inf")}
+    directory = app.config.get("METRICS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    registry.enabled = True
+    if not event.contains(Engine, "before_cursor_execute", _before_execute):
+        event.listen(Engine, "before_cursor_execute", _before_execute)
+        event.listen(Engine, "after_cursor_execute", _after_execute)
+        event.listen(Engine, "handle_error", _failed_execute)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "Registry",
+    "collect",
+    "init_app",
+    "record_call",
+    "registry",
+    "render_metrics",
+]
@@ -0,0 +1,13 @@
+from flask import Blueprint, Response, abort, current_app
+from . import render_metrics
+from .exposition import CONTENT_TYPE
+
+metrics_api = Blueprint("metrics_api", __name__)
+
+
+@metrics_api.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus scrape endpoint (all workers with METRICS_MULTIPROC_DIR)"""
+    if not current_app.config.get("METRICS_ENABLED"):
+        abort(404)
+    return Response(render_metrics(), content_type=CONTENT_TYPE)
@@ -0,0 +1,261 @@
+import glob
+import json
+import os
+import time
+
+try:
+    import fcntl  # POSIX only; without it exited workers' files are kept
+except ImportError:
+    fcntl = None
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Name (in METRICS_MULTIPROC_DIR) of the sums of exited workers' snapshots
+AGGREGATE = "aggregate"
+_worker_ids = {}  # pid -> worker_id(), recomputed after a fork
+
+HELP = {
+    "http_request_duration_seconds": "Request latency by endpoint",
+    "db_statement_duration_seconds": "SQL statement execution time",
+    "db_pool_connections_total": "Connections opened by the pool",
+    "db_pool_checkouts_total": "Connections checked out of the pool",
+    "db_pool_checked_out": "Connections currently checked out",
+    "db_pool_overflow": "Connections open beyond pool_size",
+    "s3_request_duration_seconds": "S3 call latency by operation",
+    "s3_errors_total": "S3 calls that raised",
+    "cache_requests_total": "Cache lookups by result",
+    "cache_hit_ratio": "Share of cache lookups that hit",
+}
+
+
+def snapshot(merged, gauges, buckets):
+    """JSON-able form of Registry.collect() plus [(name, labels, value)]"""
+    return {
+        "buckets": buckets,
+        "counters": [
+            [name, list(labels), value]
+            for (name, labels), value in merged["counters"].items()
+        ],
+        "histograms": [
+            [name, list(labels), counts]
+            for (name, labels), counts in merged["histograms"].items()
+        ],
+        "gauges": [
+            [name, list(labels), value] for name, labels, value in gauges
+        ],
+    }
+
+
+def _start_time(pid):
+    """Start time of a process in clock ticks since boot (Linux), or None"""
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii") as fh:
+            # The command name may contain spaces; field 22 is starttime
+            return fh.read().rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        return None
+
+
+def worker_id():
+    """<pid>-<start> of this process; a reused pid gets a different id"""
+    pid = os.getpid()
+    ident = _worker_ids.get(pid)
+    if ident is None:
+        start = _start_time(pid) or str(time.time_ns())
+        ident = _worker_ids[pid] = f"{pid}-{start}"
+    return ident
+
+
+def _alive(ident):
+    pid, start = ident.split("-", 1)
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    current = _start_time(pid)
+    return current is None or current == start
+
+
+def _write_json(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh)
+    os.replace(tmp, path)
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return None
+
+
+def write_snapshot(directory, data):
+    """Publish this worker's snapshot as <directory>/<pid>-<start>.json"""
+    _write_json(os.path.join(directory, f"{worker_id()}.json"), data)
+
+
+def _worker_snapshots(directory):
+    for path in glob.glob(os.path.join(directory, "*-*.json")):
+        try:
+            data = _read_json(path)
+        except (OSError, ValueError):  # being replaced or truncated
+            continue
+        if data is not None:
+            yield os.path.basename(path)[:-5], data
+
+
+def _fold_exited(directory, aggregate):
+    """Add exited workers' counters to ``aggregate``; returns the new one"""
+    present = dict(_worker_snapshots(directory))
+    folded = [i for i in aggregate["folded"] if i in present]
+    exited = [
+        (ident, data)
+        for ident, data in present.items()
+        if ident not in folded and not _alive(ident)
+    ]
+    if not exited and len(folded) == len(aggregate["folded"]):
+        return aggregate
+    counters, histograms, _, buckets = combine(
+        [(AGGREGATE, aggregate)] + exited
+    )
+    aggregate = snapshot(
+        {"counters": counters, "histograms": histograms}, [], buckets
+    )
+    aggregate["folded"] = folded + [ident for ident, _ in exited]
+    # Recorded before the files go, so a crash in between cannot count twice
+    _write_json(os.path.join(directory, f"{AGGREGATE}.json"), aggregate)
+    for ident in aggregate["folded"]:
+        try:
+            os.remove(os.path.join(directory, f"{ident}.json"))
+        except FileNotFoundError:
+            pass
+    return aggregate
+
+
+def read_snapshots(directory):
+    """[(worker id, snapshot)] of running workers plus the aggregate of
+    the exited ones.
+
+    Exited workers' snapshots are folded into <directory>/aggregate.json
+    and removed, under a lock so concurrent scrapes never see a worker
+    twice or not at all. Without fcntl (non-POSIX) they are left in place.
+    """
+    path = os.path.join(directory, f"{AGGREGATE}.json")
+    with open(os.path.join(directory, f"{AGGREGATE}.lock"), "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        aggregate = _read_json(path) or {
+            "buckets": {},
+            "counters": [],
+            "histograms": [],
+            "gauges": [],
+            "folded": [],
+        }
+        if fcntl is not None:
+            aggregate = _fold_exited(directory, aggregate)
+        folded = set(aggregate["folded"])
+        return [(AGGREGATE, aggregate)] + [
+            (ident, data)
+            for ident, data in _worker_snapshots(directory)
+            if ident not in folded
+        ]
+
+
+def combine(snapshots):
+    """Sum counters and histograms over workers.
+
+    Counters of exited workers are kept so totals never go backwards;
+    their gauges are dropped. With several workers gauges get a pid label.
+    """
+    counters, histograms, gauges, buckets = {}, {}, {}, {}
+    multiple = sum(ident != AGGREGATE for ident, _ in snapshots) > 1
+    for ident, data in snapshots:
+        buckets.update(data["buckets"])
+        for name, labels, value in data["counters"]:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, counts in data["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            total = histograms.setdefault(key, [0] * len(counts))
+            for i, value in enumerate(counts):
+                total[i] += value
+        if not data["gauges"] or (multiple and not _alive(ident)):
+            continue
+        for name, labels, value in data["gauges"]:
+            labels = tuple(map(tuple, labels))
+            if multiple:
+                labels += (("pid", ident.split("-", 1)[0]),)
+            gauges[(name, labels)] = value
+    return counters, histograms, gauges, buckets
+
+
+def _hit_ratios(counters):
+    totals = {}
+    for (name, labels), value in counters.items():
+        if name == "cache_requests_total":
+            labels = dict(labels)
+            hits, lookups = totals.get(labels["cache"], (0, 0))
+            hit = value if labels["result"] == "hit" else 0
+            totals[labels["cache"]] = (hits + hit, lookups + value)
+    return {
+        ("cache_hit_ratio", (("cache", cache),)): round(hits / lookups, 4)
+        for cache, (hits, lookups) in totals.items()
+        if lookups
+    }
+
+
+def _escape(value):
+    return (
+        str(value)
+        .replace("\\", r"\\")
+        .replace("\n", r"\n")
+        .replace('"', r"\"")
+    )
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(counters, histograms, gauges, buckets):
+    """Prometheus text exposition format"""
+    gauges = {**gauges, **_hit_ratios(counters)}
+    families = {}
+    for kind, series in (
+        ("counter", counters),
+        ("histogram", histograms),
+        ("gauge", gauges),
+    ):
+        for (name, labels), value in series.items():
+            families.setdefault(name, (kind, []))[1].append((labels, value))
+
+    lines = []
+    for name in sorted(families):
+        kind, samples = families[name]
+        lines.append(f"# HELP {name} {HELP.get(name, name)}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(samples):
+            if kind != "histogram":
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            bounds = list(buckets.get(name, ())) + [float("inf")]
+            cumulative = 0
+            for bound, count in zip(bounds, value):
+                cumulative += count
+                le = labels + (("le", _number(float(bound))),)
+                lines.append(f"{name}_bucket{_labels(le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,97 @@
+import bisect
+import threading
+
+# Upper bounds in seconds, Prometheus' client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Most statements finish well under the request buckets
+SQL_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    5,
+)
+
+
+class Registry:
+    """Counters and histograms of one process, sharded per thread.
+
+    Each thread writes only to its own shard, so recording takes no lock;
+    the lock is held when a thread registers its shard and when a scrape
+    merges them. Labels are tuples of (name, value) pairs.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.buckets = {}  # histogram name -> upper bounds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []  # (thread, shard)
+        self._retired = self._new_shard()  # merged shards of dead threads
+
+    @staticmethod
+    def _new_shard():
+        return {"counters": {}, "histograms": {}}
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = self._new_shard()
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def inc(self, name, labels, value=1):
+        if not self.enabled:
+            return
+        counters = self._shard()["counters"]
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name, labels, value, buckets=DEFAULT_BUCKETS):
+        if not self.enabled:
+            return
+        histograms = self._shard()["histograms"]
+        key = (name, labels)
+        counts = histograms.get(key)
+        if counts is None:
+            self.buckets.setdefault(name, buckets)
+            # One slot per bucket, then +Inf, then the sum
+            counts = histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+        counts[bisect.bisect_left(self.buckets[name], value)] += 1
+        counts[-1] += value
+
+    @staticmethod
+    def _merge(into, shard):
+        for key, value in shard["counters"].copy().items():
+            into["counters"][key] = into["counters"].get(key, 0) + value
+        for key, counts in shard["histograms"].copy().items():
+            total = into["histograms"].setdefault(key, [0] * len(counts))
+            for i, value in enumerate(list(counts)):
+                total[i] += value
+
+    def collect(self):
+        """Counters and histograms of every thread, merged"""
+        with self._lock:
+            alive = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    self._merge(self._retired, shard)
+            self._shards = alive
+            merged = self._new_shard()
+            self._merge(merged, self._retired)
+            for _, shard in alive:
+                self._merge(merged, shard)
+        return merged
+
+
+registry = Registry()
@@ -1,18 +1,25 @@
-from flask import request, jsonify
+from flask import current_app, request, jsonify, url_for
+from werkzeug.exceptions import RequestEntityTooLarge
 from flask_login import login_required, current_user
 from . import profile_api
+from .avatar_proxy import avatar_src
+from app.storage.guard import (
+    UploadRejected,
+    UploadTooLarge,
+    check_content_length,
+)
 from app.profile.profile import (
     handle_update_profile,
-    handle_avatar_upload,
     handle_skill_add,
+    handle_skill_batch,
     handle_skill_delete,
 )
-from app.aws import upload_fileobj_private
-from app.aws.s3 import presigned_get_url
-from app.profile.profile_database_manager import ProfileDatabaseManager
-
-IMAGE_MIME_ALLOW = {"image/jpeg", "image/png", "image/webp", "image/gif"}
-
+from app.auth.user_cache import load_user_snapshot
+from app.profile.avatar_jobs import (
+    AvatarUploadQueueFull,
+    get_avatar_job,
+    submit_avatar_upload,
+)
 
 # ==================== PROFILE UPDATE ====================
 @profile_api.route("/update", methods=["POST"])
@@ -47,8 +54,15 @@ def update_profile():
 @profile_api.route("/avatar", methods=["POST"])
 @login_required
 def upload_avatar():
-    """API endpoint for avatar upload"""
+    """API endpoint for avatar upload; processing happens in the background
+
+    Answers 202 with a status URL to poll, or with the final result when
+    the upload was processed inline (see cache_is_shared).
+    """
     try:
+        check_content_length(
+            request.content_length, current_app.config["AVATAR_MAX_BYTES"]
+        )
         file = request.files.get("avatar_file")
 
         if not file or file.filename == "":
@@ -56,33 +70,66 @@ def upload_avatar():
                 {"success": False, "message": "No file provided"}
             ), 400
 
-        if file.mimetype not in IMAGE_MIME_ALLOW:
-            return jsonify(
-                {"success": False, "message": "Only JPG/PNG/WEBP/GIF allowed"}
-            ), 400
-
-        result = upload_fileobj_private(
-            file, prefix=f"avatars/{current_user.id}/"
-        )
-
-        updated_user = handle_avatar_upload(current_user, result["key"])
+        job_id = submit_avatar_upload(file, current_user.id)
 
-        avatar_url = presigned_get_url(
-            updated_user.avatar_url, expires_in=3600
-        )
+        job = get_avatar_job(job_id)
+        if job and job["status"] == "failed":
+            return jsonify({"success": False, "message": job["error"]}), 400
+        if job and job["status"] == "done":
+            user = load_user_snapshot(current_user.id)
+            return jsonify(
+                {
+                    "success": True,
+                    "message": "Avatar uploaded",
+                    "job_id": job_id,
+                    "status": "done",
+                    "avatar_url": avatar_src(user, 260),
+                }
+            ), 200
 
         return jsonify(
             {
                 "success": True,
-                "message": "Avatar uploaded successfully",
-                "avatar_url": avatar_url,
+                "message": "Avatar upload accepted",
+                "job_id": job_id,
+                "status_url": url_for(
+                    "profile_api.avatar_job_status", job_id=job_id
+                ),
             }
-        ), 200
+        ), 202
 
+    except (UploadTooLarge, RequestEntityTooLarge):
+        return jsonify(
+            {"success": False, "message": "File is too large"}
+        ), 413
+    except UploadRejected:
+        return jsonify(
+            {"success": False, "message": "Only JPG/PNG/WEBP/GIF allowed"}
+        ), 400
+    except AvatarUploadQueueFull as e:
+        return jsonify({"success": False, "message": str(e)}), 503
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+@profile_api.route("/avatar/jobs/<string:job_id>", methods=["GET"])
+@login_required
+def avatar_job_status(job_id):
+    """API endpoint reporting the progress of a background avatar upload"""
+    job = get_avatar_job(job_id)
+    if not job or job["user_id"] != current_user.id:
+        return jsonify({"success": False, "message": "Job not found"}), 404
+
+    response = {
+        "success": True,
+        "job_id": job_id,
+        "status": job["status"],
+        "progress": job["progress"],
+        "error": job["error"],
+    }
+    if job["status"] == "done":
+        response["avatar_url"] = avatar_src(current_user, 260)
+    return jsonify(response), 200
 
 
 # ==================== SKILLS MANAGEMENT ====================
@@ -118,6 +165,28 @@ def add_skill():
         return jsonify({"success": False, "message": "Server error"}), 500
 
 
+@profile_api.route("/skills/batch", methods=["POST"])
+@login_required
+def add_skills_batch():
+    """API endpoint for adding or updating several skills at once"""
+    try:
+        data = request.get_json(silent=True) or {}
+        skills = handle_skill_batch(current_user, data.get("skills"))
+
+        return jsonify(
+            {
+                "success": True,
+                "message": f"Saved {len(skills)} skills",
+                "skills": skills,
+            }
+        ), 200
+
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except Exception:
+        return jsonify({"success": False, "message": "Server error"}), 500
+
+
 @profile_api.route("/skills/<int:skill_id>", methods=["DELETE"])
 @login_required
 def delete_skill(skill_id):
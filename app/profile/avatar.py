@@ -0,0 +1,110 @@
+import io
+from PIL import Image, ImageOps, UnidentifiedImageError
+from app.storage import get_storage
+
+# Types accepted for upload, detected from the file's magic bytes
+AVATAR_MIME_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
+# Square edge lengths (px) rendered for every avatar
+AVATAR_SIZES = (64, 128, 512)
+# Refuse to decode anything bigger than this (decompression bombs)
+MAX_AVATAR_PIXELS = 40_000_000
+
+# format name -> (Pillow format, content type, extension, save options)
+AVATAR_FORMATS = {
+    "webp": ("WEBP", "image/webp", "webp", {"quality": 80, "method": 4}),
+    "jpeg": (
+        "JPEG",
+        "image/jpeg",
+        "jpg",
+        {"quality": 85, "optimize": True, "progressive": True},
+    ),
+}
+
+
+def decode_avatar(fileobj, max_size=max(AVATAR_SIZES)):
+    """Decode an upload once, honouring its EXIF orientation"""
+    try:
+        image = Image.open(fileobj)
+        if image.width * image.height > MAX_AVATAR_PIXELS:
+            raise ValueError("Image dimensions are too large")
+        # JPEG can decode straight to a reduced scale, skipping most pixels
+        image.draft("RGB", (max_size * 2, max_size * 2))
+        image.seek(0)  # first frame of animated images
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        raise ValueError("Unsupported or corrupt image file")
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in (
+        image.info
+    )
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def _encode(image, fmt):
+    pil_format, _, _, options = AVATAR_FORMATS[fmt]
+    if pil_format == "JPEG" and image.mode == "RGBA":
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    buffer = io.BytesIO()
+    # No exif/icc arguments are passed, so metadata is stripped
+    image.save(buffer, format=pil_format, **options)
+    return buffer.getvalue()
+
+
+def render_variants(image, sizes=AVATAR_SIZES):
+    """Crop to a square and encode every size in every format.
+
+    Returns {size: {format: bytes}}. Each size is resized from the next
+    larger one, so the full-resolution image is only resampled once.
+    """
+    variants = {}
+    source = image
+    for size in sorted(sizes, reverse=True):
+        source = ImageOps.fit(source, (size, size), Image.Resampling.LANCZOS)
+        variants[size] = {fmt: _encode(source, fmt) for fmt in AVATAR_FORMATS}
+    return variants
+
+
+def avatar_keys(content_hash):
+    """Keys of every variant of an upload, addressed by its content hash"""
+    base = f"avatars/{content_hash}/"
+    return {
+        str(size): {
+            fmt: f"{base}{size}.{AVATAR_FORMATS[fmt][2]}"
+            for fmt in AVATAR_FORMATS
+        }
+        for size in AVATAR_SIZES
+    }
+
+
+def process_and_upload_avatar(fileobj, content_hash, progress=None):
+    """Decode, resize and upload an avatar; returns the stored keys.
+
+    The result is {"key": <largest JPEG>, "variants": {"64": {"webp": key,
+    "jpeg": key}, ...}}. Keys derive from ``content_hash`` (SHA-256 of the
+    original), so re-uploading an identical image reuses the stored
+    variants without decoding or uploading anything. ``progress(done,
+    total)`` is called after every uploaded object.
+    """
+    keys = avatar_keys(content_hash)
+    result = {"key": keys[str(max(AVATAR_SIZES))]["jpeg"], "variants": keys}
+    done, total = 0, len(AVATAR_SIZES) * len(AVATAR_FORMATS)
+
+    # Variants are uploaded largest first, so the smallest JPEG is the
+    # last object written; if it exists the whole set does
+    storage = get_storage()
+    if storage.exists(keys[str(min(AVATAR_SIZES))]["jpeg"]):
+        if progress:
+            progress(total, total)
+        return result
+
+    image = decode_avatar(fileobj)
+    for size, encoded in render_variants(image).items():
+        for fmt, data in encoded.items():
+            storage.put(data, keys[str(size)][fmt], AVATAR_FORMATS[fmt][1])
+            done += 1
+            if progress:
+                progress(done, total)
+
+    return result
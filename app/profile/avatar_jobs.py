@@ -0,0 +1,156 @@
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from app.auth.models import User
+from app.cache import cache_is_shared, get_cache
+from app.extensions import db
+from app.storage.guard import spool_upload
+from .avatar import AVATAR_MIME_TYPES, process_and_upload_avatar
+from .profile import handle_avatar_upload
+
+
+class AvatarUploadQueueFull(RuntimeError):
+    """Raised when every worker is busy and the waiting queue is full"""
+
+
+class AvatarUploadPool:
+    """Bounded worker pool that processes spooled avatar uploads.
+
+    At most ``workers + queue_size`` jobs are accepted at once; with zero
+    workers jobs run inline in the submitting request.
+    """
+
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + queue_size)
+        self._executor = (
+            ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="avatar-upload"
+            )
+            if workers
+            else None
+        )
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise AvatarUploadQueueFull("Too many avatar uploads in progress")
+        if self._executor is None:
+            try:
+                fn(*args)
+            finally:
+                self._slots.release()
+            return
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(lambda _f: self._slots.release())
+
+
+_pool_lock = threading.Lock()
+
+
+def _get_pool(app):
+    # Created on first use so every forked worker gets its own threads.
+    # Without a shared cache a status poll served by another worker would
+    # never find the job, so uploads are processed inline instead.
+    with _pool_lock:
+        pool = app.extensions.get("avatar_upload_pool")
+        if pool is None:
+            workers = app.config.get("AVATAR_UPLOAD_WORKERS", 2)
+            pool = AvatarUploadPool(
+                workers if cache_is_shared(app) else 0,
+                app.config.get("AVATAR_UPLOAD_QUEUE", 8),
+            )
+            app.extensions["avatar_upload_pool"] = pool
+        return pool
+
+
+def _spool_dir(app):
+    path = app.config.get("AVATAR_SPOOL_DIR") or os.path.join(
+        tempfile.gettempdir(), "matrix-avatar-spool"
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# ==================== JOB STATUS ====================
+def _job_key(job_id):
+    return f"avatar_job:{job_id}"
+
+
+def _set_status(job_id, user_id, status, progress, error=None):
+    get_cache().set(
+        _job_key(job_id),
+        {
+            "job_id": job_id,
+            "user_id": user_id,
+            "status": status,  # queued | processing | uploading | done | failed
+            "progress": progress,
+            "error": error,
+        },
+        ttl=current_app.config.get("AVATAR_JOB_TTL", 3600),
+    )
+
+
+def get_avatar_job(job_id):
+    """Latest status of an upload job, or None once it has expired"""
+    return get_cache().get(_job_key(job_id))
+
+
+# ==================== SUBMIT / RUN ====================
+def submit_avatar_upload(file_storage, user_id):
+    """Spool the upload to local disk and queue it; returns the job id.
+
+    The upload is size-checked, type-sniffed and hashed while spooling, so
+    invalid files raise UploadRejected before anything is queued (the
+    request's Content-Length is checked by the views, before parsing). When
+    job status is not shared between workers (CACHE_BACKEND=local) the
+    job has already finished when this returns.
+    """
+    app = current_app._get_current_object()
+    job_id = uuid.uuid4().hex
+    path = os.path.join(_spool_dir(app), job_id)
+    info = spool_upload(
+        file_storage.stream,
+        path,
+        max_bytes=app.config.get("AVATAR_MAX_BYTES", 5 * 1024 * 1024),
+        allowed_types=AVATAR_MIME_TYPES,
+    )
+
+    _set_status(job_id, user_id, "queued", 0)
+    try:
+        _get_pool(app).submit(
+            _run_upload, app, job_id, path, user_id, info.sha256
+        )
+    except AvatarUploadQueueFull:
+        os.remove(path)
+        get_cache().delete(_job_key(job_id))
+        raise
+    return job_id
+
+
+def _run_upload(app, job_id, path, user_id, content_hash):
+    with app.app_context():
+        try:
+            _set_status(job_id, user_id, "processing", 0)
+            with open(path, "rb") as spooled:
+                result = process_and_upload_avatar(
+                    spooled,
+                    content_hash,
+                    progress=lambda done, total: _set_status(
+                        job_id, user_id, "uploading", done * 100 // total
+                    ),
+                )
+            # The user's avatar only switches once every variant is stored
+            user = db.session.get(User, user_id)
+            handle_avatar_upload(user, result["key"], result["variants"])
+            _set_status(job_id, user_id, "done", 100)
+        except ValueError as e:
+            _set_status(job_id, user_id, "failed", 0, error=str(e))
+        except Exception:
+            app.logger.exception("Avatar upload %s failed", job_id)
+            _set_status(job_id, user_id, "failed", 0, error="Upload failed")
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,115 @@
+import hashlib
+import mimetypes
+import os
+import tempfile
+import threading
+from flask import current_app, url_for
+from app.storage import get_storage
+
+
+def avatar_etag(key):
+    """Strong ETag for an avatar; S3 keys never change content"""
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+class AvatarDiskCache:
+    """Bounded on-disk LRU of avatar objects, filled from storage on a miss.
+
+    A missing object raises FileNotFoundError.
+
+    Files are named after a hash of their S3 key; the modification time
+    doubles as the LRU clock and the oldest files are evicted once the
+    directory grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith("."):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def path_for(self, key):
+        return os.path.join(self.directory, avatar_etag(key))
+
+    def get(self, key):
+        """Local path of the cached object, downloading it if needed"""
+        path = self.path_for(key)
+        try:
+            os.utime(path)  # mark as recently used
+            return path
+        except FileNotFoundError:
+            pass
+
+        # Download to a temp file first so readers never see partial data
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                get_storage().download(key, tmp)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            self._size += os.path.getsize(path)
+            if self._size > self.max_bytes:
+                self._evict()
+        return path
+
+    def _evict(self):
+        # Rescan: other workers share the directory, so the running total
+        # is only an estimate
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self._size = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self._size <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+                self._size -= size
+            except FileNotFoundError:
+                pass
+
+
+def content_type_for(key):
+    ctype, _ = mimetypes.guess_type(key)
+    return ctype or "application/octet-stream"
+
+
+_cache_lock = threading.Lock()
+
+
+def get_avatar_cache():
+    app = current_app._get_current_object()
+    with _cache_lock:
+        cache = app.extensions.get("avatar_disk_cache")
+        if cache is None:
+            cache = AvatarDiskCache(
+                app.config.get("AVATAR_CACHE_DIR")
+                or os.path.join(tempfile.gettempdir(), "matrix-avatar-cache"),
+                app.config.get("AVATAR_CACHE_MAX_BYTES", 256 * 1024 * 1024),
+            )
+            app.extensions["avatar_disk_cache"] = cache
+        return cache
+
+
+def avatar_version(user):
+    """Cache-busting token that changes whenever the avatar is replaced"""
+    key = user.avatar_url
+    return avatar_etag(key)[:12] if key else None
+
+
+def avatar_src(user, size):
+    """Cache-busted proxy URL of a user's avatar, or None without one"""
+    version = avatar_version(user)
+    if not version:
+        return None
+    return url_for("profile.avatar", user_id=user.id, size=size, v=version)
@@ -1,4 +1,16 @@
 from app.extensions import db
+from sqlalchemy.orm import validates
+
+# Experience levels, lowest first; UserSkill.level_rank is the 1-based index
+SKILL_LEVELS = ("Beginner", "Intermediate", "Advanced", "Expert")
+
+
+def level_rank_for(level):
+    """Ordinal of a level name (0 for unknown levels)"""
+    try:
+        return SKILL_LEVELS.index(level) + 1
+    except ValueError:
+        return 0
 
 
 class Skill(db.Model):
@@ -6,6 +18,15 @@ class Skill(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), unique=True, nullable=False)
     user_skills = db.relationship("UserSkill", back_populates="skill")
+    # Names are unique case-insensitively; also the ON CONFLICT target
+    __table_args__ = (
+        db.Index("uq_skills_name_lower", db.func.lower(name), unique=True),
+    )
+
+
+def normalize_skill_name(name):
+    """Collapse whitespace so "  Machine   learning " matches its skill"""
+    return " ".join((name or "").split())
 
 
 class UserSkill(db.Model):
@@ -19,6 +40,28 @@ class UserSkill(db.Model):
     )
     level = db.Column(db.String(50))  # e.g., Beginner, Intermediate, Expert
     years = db.Column(db.Integer)  # Years of experience
+    # Ordinal copy of level so the directory can range-scan it
+    level_rank = db.Column(db.SmallInteger, nullable=False, default=0)
     user = db.relationship("User", back_populates="skills")
     skill = db.relationship("Skill", back_populates="user_skills")
-    __table_args__ = (db.UniqueConstraint("user_id", "skill_id", name="uq_user_skill"),)
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "skill_id", name="uq_user_skill"),
+        # Covers the directory filter: skill, then level/years ranges
+        db.Index(
+            "ix_user_skills_directory",
+            "skill_id", "level_rank", "years", "user_id",
+        ),
+    )
+
+    @validates("level")
+    def _sync_level_rank(self, key, level):
+        self.level_rank = level_rank_for(level)
+        return level
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.skill.name,
+            "level": self.level,
+            "years": self.years,
+        }
@@ -1,34 +1,22 @@
 from app.auth import User
+from app.profile.models import SKILL_LEVELS, normalize_skill_name
 from app.profile.profile_database_manager import ProfileDatabaseManager
 
 
-def handle_profile(user):
+def handle_profile(user, page=1):
     """
     Prepare profile data for display.
     Returns dict with user info, participated projects, etc.
     """
-    # Get projects the user has applied to (participated projects)
-    # Also include projects the user created
-    participated_projects = []
-    project_ids = set()
-    
-    # Add projects from applications
-    if hasattr(user, 'applications'):
-        for application in user.applications:
-            if application.project and application.project_id not in project_ids:
-                project_ids.add(application.project_id)
-                participated_projects.append(application.project)
-    
-    # Add projects the user created
-    if hasattr(user, 'projects'):
-        for project in user.projects:
-            if project.id not in project_ids:
-                project_ids.add(project.id)
-                participated_projects.append(project)
-    
+    # Projects the user applied to or created, newest first
+    pagination = ProfileDatabaseManager.get_participated_projects(
+        user.id, page=page
+    )
+
     return {
         'user': user,
-        'participated_projects': participated_projects
+        'participated_projects': pagination.items,
+        'projects_pagination': pagination,
     }
 
 
@@ -50,36 +38,73 @@ def handle_update_profile(user, data):
     return ProfileDatabaseManager.update_user_profile(user, sanitized_data)
 
 
-def handle_avatar_upload(user, s3_key):
+def handle_avatar_upload(user, s3_key, variants=None):
     """Business logic for avatar upload"""
     if not s3_key:
         raise ValueError("S3 key is required")
 
-    return ProfileDatabaseManager.update_avatar(user, s3_key)
+    return ProfileDatabaseManager.update_avatar(user, s3_key, variants)
 
 
-def handle_skill_add(user, skill_name, level, years):
-    """Business logic for adding a skill"""
+# Upper bound on entries accepted by one batch request
+MAX_SKILL_BATCH = 50
+VALID_SKILL_LEVELS = list(SKILL_LEVELS)
+
+
+def _validate_skill(skill_name, level, years):
+    """Check one skill entry; returns years as an int"""
     # Validate input
     if not skill_name or not level:
         raise ValueError("Skill name and level are required")
 
     # Validate level
-    valid_levels = ["Beginner", "Intermediate", "Advanced", "Expert"]
-    if level not in valid_levels:
-        raise ValueError(f'Level must be one of: {", ".join(valid_levels)}')
+    if level not in VALID_SKILL_LEVELS:
+        raise ValueError(
+            f'Level must be one of: {", ".join(VALID_SKILL_LEVELS)}'
+        )
 
     # Validate years
     try:
         years = int(years)
-        if years < 0 or years > 50:
-            raise ValueError("Years must be between 0 and 50")
     except (ValueError, TypeError):
         raise ValueError("Invalid years value")
+    if years < 0 or years > 50:
+        raise ValueError("Years must be between 0 and 50")
+    return years
+
 
+def handle_skill_add(user, skill_name, level, years):
+    """Business logic for adding a skill"""
+    years = _validate_skill(skill_name, level, years)
     return ProfileDatabaseManager.add_user_skill(user.id, skill_name, level, years)
 
 
+def handle_skill_batch(user, items):
+    """Business logic for adding or updating several skills at once.
+
+    items is a list of {"instrument", "level", "years"} dicts (the same
+    fields as the single-skill form); existing skills are updated.
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError("A non-empty list of skills is required")
+    if len(items) > MAX_SKILL_BATCH:
+        raise ValueError(f"At most {MAX_SKILL_BATCH} skills per request")
+
+    entries = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"Skill #{index + 1} must be an object")
+        skill_name = normalize_skill_name(item.get("instrument"))
+        level = item.get("level")
+        try:
+            years = _validate_skill(skill_name, level, item.get("years", 0))
+        except ValueError as e:
+            raise ValueError(f"Skill #{index + 1}: {e}")
+        entries.append((skill_name, level, years))
+
+    return ProfileDatabaseManager.upsert_user_skills(user.id, entries)
+
+
 def handle_skill_delete(user, user_skill_id):
     """Business logic for removing a skill"""
     user_skill = ProfileDatabaseManager.get_user_skill(user_skill_id, user.id)
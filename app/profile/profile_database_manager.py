@@ -1,9 +1,39 @@
 from app.extensions import db
 from app.auth.models import User
-from app.profile.models import Skill, UserSkill
+from app.auth.user_cache import invalidate_user, orm_user
+from app.profile.models import (
+    Skill,
+    UserSkill,
+    level_rank_for,
+    normalize_skill_name,
+)
+from app.projects.models import Application, Project
+from sqlalchemy import exists, func, or_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 
 
+def _upsert(model):
+    """INSERT construct supporting ON CONFLICT for the bound dialect,
+    None on dialects without one (callers fall back to select-then-insert)"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    return None
+
+
+def _insert_or_skip(instance):
+    """Insert in a savepoint; False when a unique key already exists"""
+    try:
+        with db.session.begin_nested():
+            db.session.add(instance)
+        return True
+    except IntegrityError:
+        return False
+
+
 class ProfileDatabaseManager:
     """Handles all profile-related database operations"""
 
@@ -12,9 +42,27 @@ class ProfileDatabaseManager:
         """Fetch user by username"""
         return User.query.filter_by(username=username).first()
 
+    @staticmethod
+    def get_participated_projects(user_id, page=1, per_page=12):
+        """Paginate distinct projects the user created or applied to.
+
+        A single EXISTS query (served by the applicant_id and creator_id
+        indexes) replaces walking user.applications row by row.
+        """
+        applied = exists().where(
+            Application.project_id == Project.id,
+            Application.applicant_id == user_id,
+        )
+        return (
+            Project.query.filter(or_(Project.creator_id == user_id, applied))
+            .order_by(Project.id.desc())
+            .paginate(page=page, per_page=per_page, error_out=False)
+        )
+
     @staticmethod
     def update_user_profile(user, data):
         """Update user profile fields"""
+        user = orm_user(user)
         try:
             # Check if username is taken by another user
             if "username" in data and data["username"] != user.username:
@@ -42,6 +90,7 @@ class ProfileDatabaseManager:
                     setattr(user, field, data[field])
 
             db.session.commit()
+            invalidate_user(user.id)
             return user
         except IntegrityError:
             db.session.rollback()
@@ -51,11 +100,14 @@ class ProfileDatabaseManager:
             raise e
 
     @staticmethod
-    def update_avatar(user, s3_key):
-        """Update user's avatar URL"""
+    def update_avatar(user, s3_key, variants=None):
+        """Update user's avatar key and its resized variants"""
+        user = orm_user(user)
         try:
             user.avatar_url = s3_key
+            user.avatar_variants = variants
             db.session.commit()
+            invalidate_user(user.id)
             return user
         except Exception as e:
             db.session.rollback()
@@ -63,15 +115,48 @@ class ProfileDatabaseManager:
 
 
     # ==================== SKILLS ====================
+    @staticmethod
+    def ensure_skills(skill_names):
+        """Create missing skills and map lower(name) -> skill id.
+
+        One INSERT ... ON CONFLICT DO NOTHING plus one SELECT, whatever
+        the number of names; concurrent creators cannot collide.
+        """
+        names = {}
+        for name in map(normalize_skill_name, skill_names):
+            if name:
+                names.setdefault(name.lower(), name)
+        if not names:
+            return {}
+
+        lowered = func.lower(Skill.name)
+        stmt = _upsert(Skill)
+        if stmt is not None:
+            db.session.execute(
+                stmt.values([{"name": name} for name in names.values()])
+                .on_conflict_do_nothing(index_elements=[lowered])
+            )
+        else:
+            existing = set(
+                db.session.scalars(
+                    db.select(lowered).where(lowered.in_(names))
+                )
+            )
+            for key, name in names.items():
+                if key not in existing:
+                    # A concurrent creator wins; the lookup below finds it
+                    _insert_or_skip(Skill(name=name))
+        rows = db.session.execute(
+            db.select(lowered, Skill.id).where(lowered.in_(names))
+        )
+        return dict(rows.all())
+
     @staticmethod
     def get_or_create_skill(skill_name):
         """Get existing skill or create new one"""
-        skill = Skill.query.filter_by(name=skill_name).first()
-        if not skill:
-            skill = Skill(name=skill_name)
-            db.session.add(skill)
-            db.session.flush()  # Get ID without committing
-        return skill
+        ids = ProfileDatabaseManager.ensure_skills([skill_name])
+        skill_id = ids[normalize_skill_name(skill_name).lower()]
+        return db.session.get(Skill, skill_id)
 
     @staticmethod
     def add_user_skill(user_id, skill_name, level, years):
@@ -86,7 +171,7 @@ class ProfileDatabaseManager:
 
             if existing:
                 raise ValueError(
-                    f"You " f"already have {skill_name} in your skills"
+                    f"You " f"already have {skill.name} in your skills"
                 )
 
             user_skill = UserSkill(
@@ -97,12 +182,94 @@ class ProfileDatabaseManager:
             return user_skill
         except IntegrityError:
             db.session.rollback()
-            raise ValueError
-            ("Skill already exists")
+            raise ValueError("Skill already exists")
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def upsert_user_skills(user_id, entries):
+        """Add or update many (skill_name, level, years) entries at once.
+
+        Runs a fixed number of statements per batch: the skill upsert and
+        lookup, then one INSERT ... ON CONFLICT (uq_user_skill) DO UPDATE.
+        Returns the affected skills as dicts (built before the commit
+        expires them).
+        """
+        try:
+            skill_ids = ProfileDatabaseManager.ensure_skills(
+                name for name, _, _ in entries
+            )
+            # Last entry wins when the same skill appears twice
+            values = {}
+            for name, level, years in entries:
+                skill_id = skill_ids[normalize_skill_name(name).lower()]
+                values[skill_id] = {
+                    "user_id": user_id,
+                    "skill_id": skill_id,
+                    "level": level,
+                    "level_rank": level_rank_for(level),
+                    "years": years,
+                }
+            if not values:
+                return []
+
+            stmt = _upsert(UserSkill)
+            if stmt is not None:
+                stmt = stmt.values(list(values.values()))
+                db.session.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=[UserSkill.user_id, UserSkill.skill_id],
+                        set_={
+                            "level": stmt.excluded.level,
+                            "level_rank": stmt.excluded.level_rank,
+                            "years": stmt.excluded.years,
+                        },
+                    )
+                )
+            else:
+                ProfileDatabaseManager._update_or_insert_skills(
+                    user_id, values
+                )
+            result = db.session.scalars(
+                db.select(UserSkill)
+                .options(db.joinedload(UserSkill.skill))
+                .where(
+                    UserSkill.user_id == user_id,
+                    UserSkill.skill_id.in_(values),
+                )
+                .execution_options(populate_existing=True)
+                .order_by(UserSkill.id)
+            ).all()
+            user_skills = [user_skill.to_dict() for user_skill in result]
+            db.session.commit()
+            return user_skills
         except Exception as e:
             db.session.rollback()
             raise e
 
+    @staticmethod
+    def _update_or_insert_skills(user_id, values):
+        """Portable upsert: update the rows that exist, insert the rest
+        (updating instead when a concurrent request inserted it first)"""
+        existing = {
+            user_skill.skill_id: user_skill
+            for user_skill in UserSkill.query.filter(
+                UserSkill.user_id == user_id, UserSkill.skill_id.in_(values)
+            )
+        }
+        for skill_id, row in values.items():
+            user_skill = existing.get(skill_id)
+            if user_skill is None:
+                if _insert_or_skip(UserSkill(**row)):
+                    continue
+                user_skill = UserSkill.query.filter_by(
+                    user_id=user_id, skill_id=skill_id
+                ).one()
+            user_skill.level = row["level"]
+            user_skill.years = row["years"]
+        db.session.flush()
+
     @staticmethod
     def get_user_skill(user_skill_id, user_id):
         """Get a specific user skill"""
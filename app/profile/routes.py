@@ -1,14 +1,25 @@
 from flask import render_template, request, redirect, url_for, flash
+from flask import abort, current_app, send_file
 from flask_login import login_required, current_user
+from app.database import use_read_replica
+from werkzeug.exceptions import RequestEntityTooLarge
 from . import profile
 from app.auth.models import User
 from app.profile.profile import handle_profile
 from app.profile.profile_database_manager import ProfileDatabaseManager
-from app.aws import upload_fileobj_private
-from app.aws.s3 import presigned_get_url
-
-# Constants
-IMAGE_MIME_ALLOW = {"image/jpeg", "image/png", "image/webp", "image/gif"}
+from app.profile.avatar_jobs import (
+    AvatarUploadQueueFull,
+    get_avatar_job,
+    submit_avatar_upload,
+)
+from app.storage.guard import UploadRejected, UploadTooLarge, check_content_length
+from app.profile.avatar_proxy import (
+    avatar_etag,
+    avatar_src,
+    avatar_version,
+    content_type_for,
+    get_avatar_cache,
+)
 
 # ==================== VIEW ROUTES (Render Templates) ====================
 
@@ -17,54 +28,127 @@ IMAGE_MIME_ALLOW = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 @login_required
 def show_profile():
     """Show current user's profile"""
-    profile_data = handle_profile(current_user)
+    page = request.args.get('page', 1, type=int)
+    profile_data = handle_profile(current_user, page=page)
     return render_template('profile.html',
                           user=profile_data['user'],
                           participated_projects=profile_data.get('participated_projects', []),
+                          projects_pagination=profile_data['projects_pagination'],
                           is_owner=True,
                           current_page='profile')
 
 
 @profile.get("/u/<string:username>")
 @login_required
+@use_read_replica
 def view_profile(username):
     """View another user's public profile"""
     user = User.query.filter_by(username=username).first_or_404()
     is_owner = user.id == current_user.id
 
-    profile_data = handle_profile(user)
+    page = request.args.get('page', 1, type=int)
+    profile_data = handle_profile(user, page=page)
     return render_template('profile.html',
                           user=profile_data['user'],
                           participated_projects=profile_data.get('participated_projects', []),
+                          projects_pagination=profile_data['projects_pagination'],
                           is_owner=is_owner,
                           current_page='profile')
 
 
+# ==================== AVATAR PROXY ====================
+
+profile.add_app_template_global(avatar_src)
+
+
+@profile.get("/avatar/<int:user_id>/<int:size>")
+@login_required
+def avatar(user_id, size):
+    """Serve an avatar variant from the local disk cache (S3 on a miss)"""
+    accepts_webp = any(
+        mimetype == "image/webp" and quality > 0
+        for mimetype, quality in request.accept_mimetypes
+    )
+    # A ?v= URL always names the same image, so revalidating it needs no
+    # user lookup
+    version = request.args.get("v")
+    versioned_etag = version and avatar_etag(
+        f"{user_id}/{size}/{version}/{int(accepts_webp)}"
+    )
+    if versioned_etag and request.if_none_match.contains(versioned_etag):
+        return _avatar_headers(
+            current_app.response_class(status=304), versioned_etag, True
+        )
+
+    user = User.query.get_or_404(user_id)
+    key = (accepts_webp and user.avatar_key_for(size, "webp")) or (
+        user.avatar_key_for(size)
+    )
+    if not key:
+        abort(404)
+
+    current = version is not None and version == avatar_version(user)
+    etag = versioned_etag if current else avatar_etag(key)
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        try:
+            path = get_avatar_cache().get(key)
+        except FileNotFoundError:
+            abort(404)
+        response = send_file(
+            path, mimetype=content_type_for(key), etag=False, max_age=None
+        )
+    return _avatar_headers(response, etag, current)
+
+
+def _avatar_headers(response, etag, versioned):
+    # Private: avatars are only shown to signed-in users, so shared caches
+    # must not keep them; the browser still reuses them by ETag and ?v=
+    response.set_etag(etag)
+    response.vary.add("Accept")
+    response.cache_control.no_cache = None
+    response.cache_control.private = True
+    if versioned:
+        # The URL changes with the avatar, so it can be cached forever
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.max_age = 300
+    return response
+
+
 # ==================== TRADITIONAL FORM HANDLERS (for backward compatibility) ====================
 
 @profile.route('/profile/avatar', methods=['POST'])
 @login_required
 def upload_avatar():
     """Traditional form handler for avatar upload"""
-    file = request.files.get("avatar_file")
+    try:
+        check_content_length(request.content_length, current_app.config["AVATAR_MAX_BYTES"])
+        file = request.files.get("avatar_file")
+    except (UploadTooLarge, RequestEntityTooLarge):
+        flash("The image is too large.", "danger")
+        return redirect(url_for("profile.show_profile"))
 
     if not file or file.filename == "":
         flash("Please choose an image file.", "warning")
         return redirect(url_for("profile.show_profile"))
 
-    if file.mimetype not in IMAGE_MIME_ALLOW:
-        flash("Only JPG/PNG/WEBP/GIF allowed.", "danger")
-        return redirect(url_for("profile.show_profile"))
-
     try:
-        result = upload_fileobj_private(
-            file, prefix=f"avatars/{current_user.id}/"
-        )
-        current_user.avatar_url = result["key"]
-        from app.extensions import db
-
-        db.session.commit()
-        flash("Avatar updated!", "success")
+        job = get_avatar_job(submit_avatar_upload(file, current_user.id))
+        if job and job["status"] == "failed":
+            flash(f"Upload failed: {job['error']}", "danger")
+        elif job and job["status"] == "done":
+            flash("Avatar uploaded!", "success")
+        else:
+            flash("Avatar uploaded! It will appear once it has been processed.", "success")
+    except UploadTooLarge:
+        flash("The image is too large.", "danger")
+    except UploadRejected:
+        flash("Only JPG/PNG/WEBP/GIF allowed.", "danger")
+    except AvatarUploadQueueFull:
+        flash("Too many uploads in progress, please try again shortly.", "warning")
     except Exception as e:
         flash(f"Upload failed: {e}", "danger")
 
@@ -0,0 +1,120 @@
+import hmac
+import time
+from urllib.parse import urlencode
+from flask import current_app, g, request
+from .profiler import RequestProfiler
+from .timing import (
+    phase,
+    phase_summary,
+    server_timing_header,
+    start_phases,
+    timed,
+)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ARG = "_profile"
+
+
+def _profile_requested():
+    flag = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_ARG)
+    if not flag:
+        return False
+    token = current_app.config.get("PROFILING_TOKEN")
+    if token:
+        return hmac.compare_digest(flag.encode(), token.encode())
+    return current_app.debug and flag == "1"
+
+
+def _recorded_path():
+    """Request path and query string without the profiling token"""
+    args = [
+        (key, value)
+        for key, value in request.args.items(multi=True)
+        if key != PROFILE_ARG
+    ]
+    return f"{request.path}?{urlencode(args)}" if args else request.path
+
+
+def _before_request():
+    config = current_app.config
+    profiling = config.get("PROFILING_ENABLED") and _profile_requested()
+    if profiling or config.get("SERVER_TIMING_ENABLED"):
+        start_phases()
+    if profiling:
+        g.request_profile = current_app.extensions["profiler"].start()
+        g.request_profile_started = time.perf_counter()
+
+
+def _after_request(response):
+    summary = phase_summary()
+    if summary is None:
+        return response
+    response.headers["Server-Timing"] = server_timing_header(summary)
+
+    profile = g.pop("request_profile", False)
+    if profile:
+        profile_id = current_app.extensions["profiler"].finish(
+            profile,
+            {
+                "endpoint": request.endpoint,
+                "method": request.method,
+                "path": _recorded_path(),
+                "status": response.status_code,
+                "duration_ms": round(
+                    (time.perf_counter() - g.request_profile_started) * 1000, 2
+                ),
+                "phases": {name: ms for name, (ms, _) in summary.items()},
+                "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+        )
+        response.headers[PROFILE_HEADER] = profile_id
+    elif profile is None:
+        # Asked for a profile while another request was being profiled
+        response.headers[PROFILE_HEADER] = "busy"
+    return response
+
+
+def _teardown_request(_exc):
+    # A request that failed before after_request still frees the profiler
+    profile = g.pop("request_profile", None)
+    if profile is not None:
+        current_app.extensions["profiler"].stop(profile)
+
+
+def init_app(app):
+    """Install the Server-Timing header and on-demand profiling hooks.
+
+    With PROFILING_ENABLED, a request sent with ``X-Profile: <token>`` (or
+    ``?_profile=<token>``) runs under cProfile and is saved to
+    PROFILING_DIR. PROFILING_TOKEN may only be left empty in debug mode,
+    where "1" is accepted instead. SERVER_TIMING_ENABLED adds the header to
+    every response; profiled responses always carry it.
+    """
+    if (
+        app.config.get("PROFILING_ENABLED")
+        and not app.config.get("PROFILING_TOKEN")
+        and not app.debug
+    ):
+        raise RuntimeError(
+            "PROFILING_TOKEN must be set to enable profiling outside debug"
+        )
+    app.extensions["profiler"] = RequestProfiler(
+        app.config["PROFILING_DIR"], keep=app.config.get("PROFILING_KEEP", 50)
+    )
+    if app.config.get("PROFILING_ENABLED") or app.config.get(
+        "SERVER_TIMING_ENABLED"
+    ):
+        app.before_request(_before_request)
+        app.after_request(_after_request)
+        app.teardown_request(_teardown_request)
+
+
+__all__ = [
+    "RequestProfiler",
+    "init_app",
+    "phase",
+    "phase_summary",
+    "server_timing_header",
+    "start_phases",
+    "timed",
+]
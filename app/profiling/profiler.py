@@ -0,0 +1,72 @@
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+import uuid
+
+
+class RequestProfiler:
+    """Runs cProfile around single requests and keeps the last ``keep``.
+
+    Each profile is written as ``<id>.prof`` (open it with pstats or
+    snakeviz) next to ``<id>.json`` holding the endpoint and timings.
+    Only one request is profiled at a time: cProfile cannot nest, and a
+    staging box should not slow down under a burst of flagged requests.
+    """
+
+    def __init__(self, directory, keep=50):
+        self.directory = directory
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    def start(self):
+        """A running cProfile.Profile, or None if another one is active"""
+        if not self._lock.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # some other profiler owns the interpreter
+            self._lock.release()
+            return None
+        return profile
+
+    def stop(self, profile):
+        """Stop ``profile`` and let the next request be profiled"""
+        try:
+            profile.disable()
+        finally:
+            self._lock.release()
+
+    def finish(self, profile, metadata):
+        """Stop ``profile``, save it with ``metadata`` and return its id"""
+        self.stop(profile)
+        endpoint = re.sub(r"[^\w.-]", "_", metadata.get("endpoint") or "none")
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        profile_id = f"{stamp}-{endpoint}-{uuid.uuid4().hex[:8]}"
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, profile_id)
+        profile.dump_stats(f"{path}.prof")
+        with open(f"{path}.json", "w", encoding="utf-8") as fh:
+            json.dump({"id": profile_id, **metadata}, fh, indent=2)
+        self._rotate()
+        return profile_id
+
+    def _rotate(self):
+        """Delete the oldest profiles beyond ``keep``"""
+        profiles = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".prof"):
+                try:
+                    profiles.append((entry.stat().st_mtime, entry.path[:-5]))
+                except FileNotFoundError:  # rotated by another worker
+                    pass
+        profiles.sort()
+        for _, path in profiles[: max(0, len(profiles) - self.keep)]:
+            for suffix in (".prof", ".json"):
+                try:
+                    os.remove(path + suffix)
+                except FileNotFoundError:
+                    pass
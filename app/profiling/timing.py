@@ -0,0 +1,138 @@
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import (
+    before_render_template,
+    g,
+    has_request_context,
+    template_rendered,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.metrics import record_call
+
+# Server-Timing metric names, in header order
+PHASES = ("db", "tpl", "s3")
+_DESCRIPTIONS = {"db": "SQL", "tpl": "Templates", "s3": "S3"}
+
+
+def start_phases():
+    """Start collecting phase timings for the current request"""
+    g.phase_times = {name: [0.0, 0] for name in PHASES}
+    g.phase_started = time.perf_counter()
+
+
+def _collecting():
+    return has_request_context() and "phase_times" in g
+
+
+def _record(name, seconds):
+    if _collecting():
+        times = g.phase_times[name]
+        times[0] += seconds
+        times[1] += 1
+
+
+@contextmanager
+def phase(name):
+    """Add the time spent in the block to a phase of the current request"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def timed(name):
+    """Decorator form of phase(); each call is also recorded in /metrics"""
+
+    def decorator(fn):
+        operation = fn.__name__.lstrip("_")
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                seconds = time.perf_counter() - start
+                _record(name, seconds)
+                record_call(name, operation, seconds, failed)
+
+        return wrapper
+
+    return decorator
+
+
+def phase_summary():
+    """{phase: (milliseconds, calls)} plus "total", or None if not collected"""
+    times = g.get("phase_times")
+    if times is None:
+        return None
+    summary = {
+        name: (round(seconds * 1000, 2), calls)
+        for name, (seconds, calls) in times.items()
+    }
+    total = time.perf_counter() - g.phase_started
+    summary["total"] = (round(total * 1000, 2), 1)
+    return summary
+
+
+def server_timing_header(summary):
+    """Format a phase_summary() as a Server-Timing header value.
+
+    Phases can overlap: SQL run lazily while a template renders is counted
+    under both db and tpl.
+    """
+    parts = []
+    for name, (ms, calls) in summary.items():
+        if name == "total":
+            parts.append(f"total;dur={ms}")
+        elif calls:
+            desc = f"{_DESCRIPTIONS[name]} x{calls}"
+            parts.append(f'{name};dur={ms};desc="{desc}"')
+    return ", ".join(parts)
+
+
+# SQL: every engine, including replica binds
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, _cursor, _statement, _parameters, _context, _many):
+    if _collecting():
+        conn.info.setdefault("phase_query_start", []).append(
+            time.perf_counter()
+        )
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, _cursor, _statement, _parameters, _context, _many):
+    started = conn.info.get("phase_query_start")
+    if started:
+        _record("db", time.perf_counter() - started.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _failed_execute(context):
+    started = context.connection and context.connection.info.get(
+        "phase_query_start"
+    )
+    if started:
+        _record("db", time.perf_counter() - started.pop())
+
+
+# Templates: Flask signals sent around each render_template call
+def _before_render(_app, template, **_extra):
+    if _collecting():
+        g.setdefault("phase_render_start", []).append(time.perf_counter())
+
+
+def _after_render(_app, template, **_extra):
+    started = g.get("phase_render_start") if _collecting() else None
+    if started:
+        _record("tpl", time.perf_counter() - started.pop())
+
+
+before_render_template.connect(_before_render)
+template_rendered.connect(_after_render)
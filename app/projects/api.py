@@ -7,23 +7,41 @@ from .project import (
     get_project_applicants,
     get_project_by_id,
     get_all_projects,
+    parse_project_fields,
+    parse_project_includes,
 )
 
 
 @project_api.route("/api/projects", methods=["GET"])
 def get_projects():
-    projects = get_all_projects()
-    return jsonify({"projects": [p.to_dict() for p in projects]}), 200
+    """List projects; supports ?fields=id,name&include=creator,progress"""
+    try:
+        fields = parse_project_fields(request.args.get("fields"))
+        include = parse_project_includes(request.args.get("include"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    projects = get_all_projects(fields, include)
+    return jsonify(
+        {"projects": [p.to_dict(fields, include) for p in projects]}
+    ), 200
 
 
 @project_api.route("/api/project/<int:project_id>", methods=["GET"])
 def get_project(project_id):
-    project = get_project_by_id(project_id)
+    """Project detail; supports the same ?fields= and ?include= as the list"""
+    try:
+        fields = parse_project_fields(request.args.get("fields"))
+        include = parse_project_includes(request.args.get("include"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    project = get_project_by_id(project_id, fields, include, use_cache=True)
 
     if not project:
         return jsonify({"error": "Project not found"}), 404
 
-    return jsonify(project.to_dict()), 200
+    return jsonify(project.to_dict(fields, include)), 200
 
 
 @project_api.route("/api/create_project", methods=["POST"])
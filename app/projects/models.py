@@ -1,16 +1,31 @@
 from app.extensions import db
 from datetime import datetime
 
+# Columns a client may request through ``?fields=`` on the project APIs
+PROJECT_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "sector",
+    "people_count",
+    "skills",
+    "creator_id",
+)
+# Related data a client may request through ``?include=``
+PROJECT_INCLUDES = ("creator", "links", "tasks", "progress")
+
 
 class Project(db.Model):
     __tablename__ = "projects"
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
-    sector = db.Column(db.String(50), nullable=False)
+    sector = db.Column(db.String(50), nullable=False, index=True)
     people_count = db.Column(db.Integer, nullable=False)
     skills = db.Column(db.Text)  # Store skills as a comma-separated string
-    creator_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
+    creator_id = db.Column(
+        db.Integer, db.ForeignKey("user.id"), nullable=True, index=True
+    )
 
     creator = db.relationship("User", backref=db.backref("projects", lazy=True))
 
@@ -22,23 +37,50 @@ class Project(db.Model):
         self.skills = skills
         self.creator = creator
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "sector": self.sector,
-            "people_count": self.people_count,
-            "skills": self.skills.split(",") if self.skills else [],
-            "creator_id": self.creator_id,
-        }
+    def to_dict(self, fields=None, include=()):
+        """Serialize the project.
+
+        Only the requested ``fields`` are read, so a row loaded with a
+        ``load_only`` projection is never refreshed from the database.
+        """
+        data = {}
+        for field in fields or PROJECT_FIELDS:
+            if field == "skills":
+                data["skills"] = self.skills.split(",") if self.skills else []
+            else:
+                data[field] = getattr(self, field)
+
+        if "creator" in include:
+            data["creator"] = (
+                {"id": self.creator.id, "username": self.creator.username}
+                if self.creator
+                else None
+            )
+        if "links" in include:
+            data["links"] = [link.to_dict() for link in self.links]
+        if "tasks" in include:
+            data["tasks"] = [task.to_dict() for task in self.tasks]
+        if "progress" in include:
+            data["progress"] = self.progress
+        return data
+
+    @property
+    def progress(self):
+        """Percentage of finished tasks"""
+        total = len(self.tasks)
+        done = sum(1 for t in self.tasks if t.is_done)
+        return int((done / total) * 100) if total > 0 else 0
 
 
 class Application(db.Model):
     __tablename__ = "applications"
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"), nullable=False)
-    applicant_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    project_id = db.Column(
+        db.Integer, db.ForeignKey("projects.id"), nullable=False, index=True
+    )
+    applicant_id = db.Column(
+        db.Integer, db.ForeignKey("user.id"), nullable=False, index=True
+    )
     information = db.Column(db.Text, nullable=False)
     skills = db.Column(db.Text, nullable=False)
     contact_info = db.Column(db.String(200))
@@ -58,7 +100,9 @@ class Application(db.Model):
 class ProjectLink(db.Model):
     __tablename__ = "project_links"
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"), nullable=False)
+    project_id = db.Column(
+        db.Integer, db.ForeignKey("projects.id"), nullable=False, index=True
+    )
     label = db.Column(db.String(100), nullable=False)
     url = db.Column(db.String(300), nullable=False)
 
@@ -66,11 +110,16 @@ class ProjectLink(db.Model):
         "Project", backref=db.backref("links", lazy=True, cascade="all, delete-orphan")
     )
 
+    def to_dict(self):
+        return {"id": self.id, "label": self.label, "url": self.url}
+
 
 class Task(db.Model):
     __tablename__ = "tasks"
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"), nullable=False)
+    project_id = db.Column(
+        db.Integer, db.ForeignKey("projects.id"), nullable=False, index=True
+    )
     title = db.Column(db.String(200), nullable=False)
     is_done = db.Column(db.Boolean, default=False, nullable=False)
     assignee_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
@@ -79,11 +128,21 @@ class Task(db.Model):
     )
     assignee = db.relationship("User", backref=db.backref("assigned_tasks", lazy=True))
 
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "title": self.title,
+            "is_done": self.is_done,
+            "assignee_id": self.assignee_id,
+        }
+
 
 class ChatMessage(db.Model):
     __tablename__ = "chat_messages"
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"), nullable=False)
+    project_id = db.Column(
+        db.Integer, db.ForeignKey("projects.id"), nullable=False, index=True
+    )
     author_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     body = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -111,6 +170,11 @@ class ProjectNote(db.Model):
     )
     author = db.relationship("User", backref=db.backref("notes", lazy=True))
 
+    # Serves the per-author note lookup in handle_project_gui
+    __table_args__ = (
+        db.Index("ix_project_notes_lookup", "project_id", "author_id", "title"),
+    )
+
     def __init__(self, project_id, author_id, content, title=None):
         self.project_id = project_id
         self.author_id = author_id
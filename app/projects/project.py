@@ -1,9 +1,18 @@
 from app.extensions import db
 from flask_login import current_user
 from flask import request
-from .models import Application, Task, ChatMessage, ProjectLink, ProjectNote
+from .models import (
+    Application,
+    Task,
+    ChatMessage,
+    ProjectLink,
+    ProjectNote,
+    PROJECT_FIELDS,
+    PROJECT_INCLUDES,
+)
 
 from .project_database_manager import ProjectDatabaseManager
+from . import project_cache
 
 
 def handle_project_create(
@@ -65,7 +74,7 @@ def handle_apply_project(project_id, form, creator_id):
 
 def handle_project_gui(project_id):
     """Full interactive project GUI (tasks, chat, progress bar, links)"""
-    project = ProjectDatabaseManager.get_project_by_id(project_id)
+    project = get_project_by_id(project_id, use_cache=True)
 
     note = ProjectNote.query.filter_by(
         project_id=project.id, author_id=current_user.id, title=None
@@ -135,24 +144,19 @@ def handle_project_gui(project_id):
                 note.content = content
             db.session.commit()
 
-            # Compute progress
-    total = len(project.tasks)
-    done = sum(1 for t in project.tasks if t.is_done)
-    progress = int((done / total) * 100) if total > 0 else 0
-
     return {
         "project": project,
         "tasks": project.tasks,
         "messages": project.messages,
         "links": project.links,
         "note_content": note_content,
-        "progress": progress,
+        "progress": project.progress,
     }
 
 
 def get_project_applicants(project_id, creator_id):
     # Check if current user is the project creator
-    project = get_project_by_id(project_id)
+    project = get_project_by_id(project_id, use_cache=True)
 
     if not project:
         raise ValueError(f"Project {project_id} not found")
@@ -167,11 +171,43 @@ def get_project_applicants(project_id, creator_id):
     return project.applications
 
 
-def get_project_by_id(project_id):
+def _parse_list_param(raw, allowed, param):
+    """Split a comma-separated query parameter and validate its entries"""
+    if not raw:
+        return ()
+    values = tuple(dict.fromkeys(v.strip() for v in raw.split(",") if v.strip()))
+    unknown = [v for v in values if v not in allowed]
+    if unknown:
+        raise ValueError(
+            f'Unknown {param}: {", ".join(unknown)}. '
+            f'Allowed: {", ".join(allowed)}'
+        )
+    return values
+
+
+def parse_project_fields(raw):
+    """Parse ``?fields=`` into a tuple of Project columns (empty = all)"""
+    return _parse_list_param(raw, PROJECT_FIELDS, "fields")
+
+
+def parse_project_includes(raw):
+    """Parse ``?include=`` into a tuple of related data to embed"""
+    return _parse_list_param(raw, PROJECT_INCLUDES, "include")
+
+
+def get_project_by_id(project_id, fields=None, include=(), use_cache=False):
+    """Fetch a project; ``use_cache`` opts the caller into the row cache.
+
+    Includes bypass the cache because they rely on eager-load plans.
+    """
     database_manager = ProjectDatabaseManager()
-    return database_manager.get_project_by_id(project_id)
+    if use_cache and not include and project_cache.enabled():
+        return project_cache.get_project(
+            project_id, database_manager.get_project_by_id
+        )
+    return database_manager.get_project_by_id(project_id, fields, include)
 
 
-def get_all_projects():
+def get_all_projects(fields=None, include=()):
     database_manager = ProjectDatabaseManager()
-    return database_manager.get_all_projects()
+    return database_manager.get_all_projects(fields, include)
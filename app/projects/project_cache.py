@@ -0,0 +1,95 @@
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from app.cache import cache_is_shared, cache_stats, get_cache
+from app.extensions import db
+from .models import Project
+
+CACHE_NAME = "project"
+_PENDING_KEY = "project_cache_invalidate"
+
+
+def _key(project_id):
+    return f"project:{project_id}"
+
+
+def project_to_row(project):
+    """Column values of a project as a JSON-safe dict"""
+    return {
+        column.key: getattr(project, column.key)
+        for column in Project.__table__.columns
+    }
+
+
+def project_from_row(row):
+    """Attach a cached row to the session without querying.
+
+    The instance is built with committed (history-free) values and merged
+    with ``load=False``; relationships still lazy-load on first access.
+    """
+    project = Project.__mapper__.class_manager.new_instance()
+    for name, value in row.items():
+        set_committed_value(project, name, value)
+    make_transient_to_detached(project)
+    return db.session.merge(project, load=False)
+
+
+def enabled():
+    """Whether project rows may be cached.
+
+    Commits invalidate the cache of the worker that made them only, so
+    rows are cached only in a shared cache. PROJECT_CACHE_LOCAL opts a
+    single-process deployment into the local cache.
+    """
+    return cache_is_shared() or current_app.config.get(
+        "PROJECT_CACHE_LOCAL", False
+    )
+
+
+def get_project(project_id, loader):
+    """Read-through lookup: cache first, ``loader(project_id)`` on a miss"""
+    cache = get_cache()
+    row = cache.get(_key(project_id))
+    cache_stats.record(CACHE_NAME, hit=row is not None)
+    if row is not None:
+        return project_from_row(row)
+
+    project = loader(project_id)
+    if project is not None:
+        cache.set(
+            _key(project_id),
+            project_to_row(project),
+            ttl=current_app.config.get("PROJECT_CACHE_TTL"),
+        )
+    return project
+
+
+def invalidate(*project_ids):
+    """Drop cached rows; ORM commits do this on their own.
+
+    Core ``update()``/``delete()`` statements skip the commit hooks, so
+    code issuing them on projects must call this.
+    """
+    get_cache().delete(*(_key(project_id) for project_id in project_ids))
+
+
+# ==================== COMMIT HOOKS ====================
+@event.listens_for(Session, "after_flush")
+def _collect_changed_projects(session, _flush_context):
+    changed = session.info.setdefault(_PENDING_KEY, set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Project) and obj.id is not None:
+            changed.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_projects(session):
+    changed = session.info.pop(_PENDING_KEY, None)
+    if changed and has_app_context() and "cache" in current_app.extensions:
+        invalidate(*changed)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changed_projects(session, _previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
@@ -1,3 +1,4 @@
+from sqlalchemy.orm import load_only, selectinload
 from .models import Project
 from app.auth.models import User
 from app.extensions import db
@@ -23,12 +24,42 @@ class ProjectDatabaseManager:
         return project
 
     @staticmethod
-    def get_project_by_id(project_id):
-        return Project.query.get(project_id)
+    def project_load_options(fields=None, include=()):
+        """Build loader options for a sparse fieldset and its includes.
+
+        ``fields`` becomes a ``load_only`` projection and every include gets
+        its own ``selectinload``, so a project is loaded in at most one query
+        plus one per include whatever the number of rows.
+        """
+        options = []
+        if fields:
+            columns = set(fields)
+            if "creator" in include:
+                columns.add("creator_id")
+            options.append(
+                load_only(*(getattr(Project, name) for name in sorted(columns)))
+            )
+        if "creator" in include:
+            options.append(
+                selectinload(Project.creator).load_only(User.id, User.username)
+            )
+        if "links" in include:
+            options.append(selectinload(Project.links))
+        if "tasks" in include or "progress" in include:
+            options.append(selectinload(Project.tasks))
+        return options
+
+    @staticmethod
+    def get_project_by_id(project_id, fields=None, include=()):
+        options = ProjectDatabaseManager.project_load_options(fields, include)
+        if not options:
+            return Project.query.get(project_id)
+        return Project.query.options(*options).filter_by(id=project_id).first()
 
     @staticmethod
-    def get_all_projects():
-        return Project.query.all()
+    def get_all_projects(fields=None, include=()):
+        options = ProjectDatabaseManager.project_load_options(fields, include)
+        return Project.query.options(*options).all()
 
     @staticmethod
     def apply_to_project(project_id, user_id, application):
@@ -13,7 +13,7 @@ def projects():
 
 @project.route("/project/<int:project_id>")
 def project_detail(project_id):
-    project = get_project_by_id(project_id)
+    project = get_project_by_id(project_id, use_cache=True)
     return render_template("project_detail.html", project=project)
 
 
@@ -28,14 +28,14 @@ def create_project():
 @login_required
 def apply_project(project_id):
     form = ApplicationForm()
-    project = get_project_by_id(project_id)
+    project = get_project_by_id(project_id, use_cache=True)
     return render_template("apply_project.html", project=project, form=form)
 
 
 @project.route("/project/<int:project_id>/applicants")
 @login_required
 def project_applicants(project_id):
-    project = get_project_by_id(project_id)
+    project = get_project_by_id(project_id, use_cache=True)
     return render_template("applicants_list.html", project=project)
 
 
@@ -0,0 +1,46 @@
+from .compression import (
+    API_MIMETYPES,
+    TEXT_MIMETYPES,
+    ResponseCompressor,
+    choose_encoding,
+    compress,
+)
+from .provider import FastJSONProvider
+
+
+def init_app(app):
+    """Install the fast JSON provider and response compression.
+
+    JSON_FAST_PROVIDER swaps in FastJSONProvider (orjson when installed),
+    API_MSGPACK_ENABLED lets it answer in MessagePack when asked, and
+    COMPRESS_ENABLED gzip/brotli-encodes JSON and MessagePack responses of
+    at least COMPRESS_MIN_SIZE bytes for clients that accept it (HTML and
+    other text too with COMPRESS_HTML_ENABLED).
+    """
+    if app.config.get("JSON_FAST_PROVIDER", True):
+        provider = FastJSONProvider(app)
+        provider.msgpack = app.config.get("API_MSGPACK_ENABLED", False)
+        app.json = provider
+    if app.config.get("COMPRESS_ENABLED", True):
+        mimetypes = API_MIMETYPES
+        if app.config.get("COMPRESS_HTML_ENABLED", False):
+            mimetypes = API_MIMETYPES | TEXT_MIMETYPES
+        app.after_request(
+            ResponseCompressor(
+                min_size=app.config.get("COMPRESS_MIN_SIZE", 1024),
+                gzip_level=app.config.get("COMPRESS_GZIP_LEVEL", 5),
+                brotli_quality=app.config.get("COMPRESS_BROTLI_QUALITY", 5),
+                mimetypes=mimetypes,
+            )
+        )
+
+
+__all__ = [
+    "API_MIMETYPES",
+    "FastJSONProvider",
+    "TEXT_MIMETYPES",
+    "ResponseCompressor",
+    "choose_encoding",
+    "compress",
+    "init_app",
+]
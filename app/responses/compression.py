@@ -0,0 +1,85 @@
+import gzip
+from flask import request
+
+# Binary formats (images, archives) are already compressed. API payloads
+# are compressed by default; pages that reflect user input next to secrets
+# (CSRF tokens) leak them under compression (BREACH), so text is opt-in.
+API_MIMETYPES = frozenset({"application/json", "application/msgpack"})
+TEXT_MIMETYPES = frozenset(
+    {
+        "application/javascript",
+        "text/css",
+        "text/html",
+        "text/javascript",
+        "text/plain",
+        "image/svg+xml",
+    }
+)
+
+try:
+    import brotli  # optional dependency; gzip only without it
+except ImportError:
+    brotli = None
+
+
+def choose_encoding(accept_encodings):
+    """The encoding to use: br, then gzip; None if the client takes neither"""
+    candidates = ("br", "gzip") if brotli is not None else ("gzip",)
+    best = max(candidates, key=accept_encodings.quality)
+    return best if accept_encodings.quality(best) > 0 else None
+
+
+def compress(data, encoding, gzip_level=5, brotli_quality=5):
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+class ResponseCompressor:
+    """after_request hook that gzip/brotli-encodes large responses.
+
+    Only ``mimetypes`` (API payloads by default) are compressed. Streamed
+    and passthrough responses (files sent with send_file) are left alone,
+    as is anything below ``min_size`` bytes where the headers would
+    outweigh the savings.
+    """
+
+    def __init__(
+        self,
+        min_size=1024,
+        gzip_level=5,
+        brotli_quality=5,
+        mimetypes=API_MIMETYPES,
+    ):
+        self.min_size = min_size
+        self.mimetypes = mimetypes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def __call__(self, response):
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in self.mimetypes
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        response.set_data(
+            compress(data, encoding, self.gzip_level, self.brotli_quality)
+        )
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # The bytes differ from the identity encoding's
+            response.set_etag(etag, weak=True)
+        return response
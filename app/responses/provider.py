@@ -0,0 +1,87 @@
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+MSGPACK_MIMETYPES = ("application/msgpack", "application/x-msgpack")
+
+try:
+    import orjson  # optional dependency; stdlib json is used without it
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # optional dependency for MessagePack responses
+except ImportError:
+    msgpack = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson when it is installed.
+
+    Output matches the default provider: keys are sorted and dates, Decimals
+    and other non-JSON types go through the same ``default`` hook. Anything
+    orjson refuses (e.g. integers beyond 64 bits) falls back to stdlib json.
+    With ``msgpack`` set, jsonify() answers in MessagePack to clients that
+    prefer it in their Accept header.
+    """
+
+    msgpack = False
+
+    def _orjson_options(self, indent):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def _dumps_bytes(self, obj, indent=None):
+        if orjson is not None and indent in (None, 2):
+            try:
+                return orjson.dumps(
+                    obj,
+                    default=self.default,
+                    option=self._orjson_options(indent),
+                )
+            except orjson.JSONEncodeError:
+                pass
+        kwargs = {"indent": indent} if indent else {"separators": (",", ":")}
+        return super().dumps(obj, **kwargs).encode()
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or set(kwargs) - {"indent", "separators"}:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj, kwargs.get("indent")).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def _wants_msgpack(self):
+        if not (
+            self.msgpack and msgpack is not None and has_request_context()
+        ):
+            return False
+        best = request.accept_mimetypes.best_match(
+            (self.mimetype,) + MSGPACK_MIMETYPES, default=self.mimetype
+        )
+        return best in MSGPACK_MIMETYPES
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self._wants_msgpack():
+            response = self._app.response_class(
+                msgpack.packb(obj, default=self.default),
+                mimetype=MSGPACK_MIMETYPES[0],
+            )
+        else:
+            pretty = (self.compact is None and self._app.debug) or (
+                self.compact is False
+            )
+            response = self._app.response_class(
+                self._dumps_bytes(obj, 2 if pretty else None) + b"\n",
+                mimetype=self.mimetype,
+            )
+        if self.msgpack and msgpack is not None:
+            response.vary.add("Accept")
+        return response
@@ -1,24 +1,47 @@
 from flask import Blueprint, request, jsonify
+from .search import handle_directory
 from .search_database_manager import SearchDatabaseManager
 from app.auth.models import User
 from app.projects.models import Project
 from app.profile.models import Skill
+from app.database import use_read_replica
+from app.storage import get_storage
 
 search_api = Blueprint('search_api', __name__, url_prefix='/api/search')
+directory_api = Blueprint('directory_api', __name__, url_prefix='/api/users')
 
 
-def serialize_user(user):
-    """Serialize user to dictionary"""
+def serialize_user(user, avatar_urls=None):
+    """Serialize user to dictionary
+
+    ``avatar_urls`` is a {key: url} map pre-signed by serialize_users.
+    """
+    if avatar_urls is not None:
+        avatar_url = avatar_urls.get(user.avatar_key_for(64))
+        avatar_webp_url = avatar_urls.get(user.avatar_key_for(64, 'webp'))
+    else:
+        avatar_url = user.avatar_presigned_for(64)
+        avatar_webp_url = user.avatar_presigned_for(64, 'webp')
     return {
         'id': user.id,
         'username': user.username,
         'email': user.email,
         'bio': user.bio or '',
         'contact_info': user.contact_info or '',
-        'avatar_url': user.avatar_presigned if hasattr(user, 'avatar_presigned') else None
+        # Search results show a small thumbnail, so the 64px variant is enough
+        'avatar_url': avatar_url,
+        'avatar_webp_url': avatar_webp_url,
     }
 
 
+def serialize_users(users):
+    """Serialize a list of users, signing all avatar URLs in one batch"""
+    avatar_urls = get_storage().get_urls(
+        user.avatar_key_for(64, fmt) for user in users for fmt in ('jpeg', 'webp')
+    )
+    return [serialize_user(u, avatar_urls) for u in users]
+
+
 def serialize_project(project):
     """Serialize project to dictionary"""
     return {
@@ -41,6 +64,7 @@ def serialize_skill(skill):
 
 
 @search_api.route('/all', methods=['GET'])
+@use_read_replica
 def search_all():
     """Search across all entities (users, projects, skills)"""
     try:
@@ -63,7 +87,7 @@ def search_all():
         return jsonify({
             'success': True,
             'query': query,
-            'users': [serialize_user(u) for u in results['users']],
+            'users': serialize_users(results['users']),
             'projects': [serialize_project(p) for p in results['projects']],
             'skills': [serialize_skill(s) for s in results['skills']],
             'counts': results['counts']
@@ -77,6 +101,7 @@ def search_all():
 
 
 @search_api.route('/users', methods=['GET'])
+@use_read_replica
 def search_users():
     """Search for users only"""
     try:
@@ -89,7 +114,7 @@ def search_users():
         return jsonify({
             'success': True,
             'query': query,
-            'users': [serialize_user(u) for u in users],
+            'users': serialize_users(users),
             'count': total_count,
             'limit': limit,
             'offset': offset
@@ -103,6 +128,7 @@ def search_users():
 
 
 @search_api.route('/projects', methods=['GET'])
+@use_read_replica
 def search_projects():
     """Search for projects only"""
     try:
@@ -129,6 +155,7 @@ def search_projects():
 
 
 @search_api.route('/skills', methods=['GET'])
+@use_read_replica
 def search_skills():
     """Search for skills only"""
     try:
@@ -153,3 +180,26 @@ def search_skills():
             'error': str(e)
         }), 500
 
+
+
+@directory_api.route('/directory', methods=['GET'])
+@use_read_replica
+def user_directory():
+    """Find people by skills, minimum level and years (keyset paged)"""
+    try:
+        page = handle_directory(request.args)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    users = serialize_users([r['user'] for r in page['results']])
+    results = []
+    for user, result in zip(users, page['results']):
+        user['matched_skills'] = result['matched']
+        user['skills'] = [s.to_dict() for s in result['skills']]
+        results.append(user)
+
+    return jsonify({
+        'success': True,
+        'users': results,
+        'next_cursor': page['next_cursor'],
+    }), 200
@@ -1,10 +1,12 @@
 from flask import render_template, request
 from .search import handle_search
 from app.search import bp
+from app.database import use_read_replica
 
 
 @bp.route('/', methods=['GET'])
 @bp.get("/all")
+@use_read_replica
 def search_all():
     """Render search page with results"""
     query = request.args.get("q", "").strip()
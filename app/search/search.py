@@ -1,4 +1,13 @@
+import base64
+import binascii
+import json
+
 from .search_database_manager import SearchDatabaseManager
+from app.profile.models import SKILL_LEVELS, level_rank_for
+
+DIRECTORY_PAGE_SIZE = 20
+DIRECTORY_MAX_PAGE_SIZE = 100
+DIRECTORY_MAX_SKILLS = 10
 
 
 def handle_search(query):
@@ -34,4 +43,97 @@ def handle_search(query):
         "skills": results["skills"],
         "counts": results["counts"],
         "preview_limit": PREVIEW,
-    }
\ No newline at end of file
+    }
+
+
+def encode_cursor(sort_key):
+    """Opaque ?cursor= token for a directory sort key"""
+    raw = json.dumps(list(sort_key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor; raises ValueError on tampered tokens"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        sort_key = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise ValueError("Invalid cursor")
+    if (
+        not isinstance(sort_key, list)
+        or len(sort_key) != 4
+        or not all(isinstance(v, int) for v in sort_key)
+    ):
+        raise ValueError("Invalid cursor")
+    return tuple(sort_key)
+
+
+def handle_directory(args):
+    """
+    Filter people by skills, minimum level and minimum years
+
+    Args:
+        args: Request args with skills (comma-separated or repeated),
+            min_level, min_years, match (any|all), limit and cursor
+
+    Returns:
+        dict: results (user, matched, skills) best first, next_cursor
+    """
+    skills = []
+    for raw in args.getlist("skills"):
+        skills.extend(v.strip() for v in raw.split(",") if v.strip())
+    skills = list(dict.fromkeys(skills))
+    if not skills:
+        raise ValueError("At least one skill is required")
+    if len(skills) > DIRECTORY_MAX_SKILLS:
+        raise ValueError(f"At most {DIRECTORY_MAX_SKILLS} skills per query")
+
+    min_level = args.get("min_level")
+    min_rank = level_rank_for(min_level) if min_level else 0
+    if min_level and not min_rank:
+        raise ValueError(
+            f'min_level must be one of: {", ".join(SKILL_LEVELS)}'
+        )
+
+    try:
+        min_years = int(args.get("min_years", 0))
+        limit = int(args.get("limit", DIRECTORY_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("min_years and limit must be integers")
+    limit = max(1, min(limit, DIRECTORY_MAX_PAGE_SIZE))
+
+    match = args.get("match", "any")
+    if match not in ("any", "all"):
+        raise ValueError("match must be 'any' or 'all'")
+
+    cursor = args.get("cursor")
+    after = decode_cursor(cursor) if cursor else None
+
+    # Fetch one extra row to know whether there is a next page
+    rows = SearchDatabaseManager.search_directory(
+        skills,
+        min_rank=min_rank,
+        min_years=min_years,
+        match_all=match == "all",
+        limit=limit + 1,
+        after=after,
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    users, user_skills = SearchDatabaseManager.get_directory_details(
+        [row[3] for row in rows], skills, min_rank, min_years
+    )
+    results = [
+        {
+            "user": users[user_id],
+            "matched": matched,
+            "skills": user_skills.get(user_id, []),
+        }
+        for matched, _, _, user_id in rows
+        if user_id in users
+    ]
+    return {
+        "results": results,
+        "next_cursor": encode_cursor(rows[-1]) if has_more else None,
+    }
@@ -1,8 +1,8 @@
 from app.extensions import db
 from app.auth.models import User
 from app.projects.models import Project
-from app.profile.models import Skill
-from sqlalchemy import func
+from app.profile.models import Skill, UserSkill
+from sqlalchemy import and_, func, or_
 
 
 class SearchDatabaseManager:
@@ -127,3 +127,98 @@ class SearchDatabaseManager:
             }
         }
 
+    @staticmethod
+    def search_directory(skill_names, min_rank=0, min_years=0,
+                         match_all=False, limit=20, after=None):
+        """
+        Find people by skills, minimum level and minimum experience
+
+        Matching rows come from the (skill_id, level_rank, years, user_id)
+        index; users are ranked by number of matched skills, then summed
+        level and years, and paged by keyset rather than OFFSET.
+
+        Args:
+            skill_names: Skill names to look for (case-insensitive)
+            min_rank: Minimum UserSkill.level_rank for a skill to match
+            min_years: Minimum years of experience for a skill to match;
+                skills without years recorded only match when it is 0
+            match_all: Only return users matching every requested skill
+            limit: Page size
+            after: Sort key (matched, rank, years, user_id) of the last
+                row of the previous page
+
+        Returns:
+            list: (matched, rank, years, user_id) sort keys, best first
+        """
+        lowered = [name.lower() for name in skill_names]
+        skill_ids = db.session.scalars(
+            db.select(Skill.id).where(func.lower(Skill.name).in_(lowered))
+        ).all()
+        if not skill_ids or (match_all and len(skill_ids) < len(lowered)):
+            return []
+
+        matched = func.count().label("matched")
+        rank = func.sum(UserSkill.level_rank).label("rank")
+        years = func.coalesce(func.sum(UserSkill.years), 0).label("years")
+        query = (
+            db.select(matched, rank, years, UserSkill.user_id)
+            .where(
+                UserSkill.skill_id.in_(skill_ids),
+                UserSkill.level_rank >= min_rank,
+            )
+            .group_by(UserSkill.user_id)
+        )
+        if min_years > 0:
+            query = query.where(UserSkill.years >= min_years)
+        if match_all:
+            query = query.having(func.count() == len(skill_ids))
+        if after is not None:
+            a_matched, a_rank, a_years, a_user_id = after
+            query = query.having(or_(
+                func.count() < a_matched,
+                and_(func.count() == a_matched, or_(
+                    rank < a_rank,
+                    and_(rank == a_rank, or_(
+                        years < a_years,
+                        and_(years == a_years,
+                             UserSkill.user_id > a_user_id),
+                    )),
+                )),
+            ))
+        query = query.order_by(
+            matched.desc(), rank.desc(), years.desc(), UserSkill.user_id
+        ).limit(limit)
+        return [tuple(row) for row in db.session.execute(query)]
+
+    @staticmethod
+    def get_directory_details(user_ids, skill_names, min_rank=0,
+                              min_years=0):
+        """
+        Load users and their matching skills for a directory page
+
+        Returns:
+            tuple: ({user_id: User}, {user_id: [UserSkill, ...]})
+        """
+        if not user_ids:
+            return {}, {}
+        users = User.query.filter(User.id.in_(user_ids)).all()
+        query = (
+            UserSkill.query.join(UserSkill.skill)
+            .options(db.contains_eager(UserSkill.skill))
+            .filter(
+                UserSkill.user_id.in_(user_ids),
+                func.lower(Skill.name).in_(
+                    [name.lower() for name in skill_names]
+                ),
+                UserSkill.level_rank >= min_rank,
+            )
+        )
+        if min_years > 0:
+            query = query.filter(UserSkill.years >= min_years)
+        rows = query.order_by(
+            UserSkill.level_rank.desc(), UserSkill.years.desc()
+        ).all()
+        skills = {}
+        for row in rows:
+            skills.setdefault(row.user_id, []).append(row)
+        return {user.id: user for user in users}, skills
@@ -110,9 +110,15 @@ async function handleAvatarUpload(event) {
             body: formData  // Don't set Content-Type header - browser will set it with boundary
         });
 
-        const result = await response.json();
+        let result = await response.json();
 
-        if (result.success) {
+        // Uploads are processed in the background; poll until the job ends
+        if (response.status === 202 && result.success) {
+            showMessage('Processing avatar...', 'info');
+            result = await waitForAvatarJob(result.status_url);
+        }
+
+        if (result.success && result.status === 'done') {
             showMessage('Avatar uploaded successfully!', 'success');
 
             // Update avatar image
@@ -121,7 +127,7 @@ async function handleAvatarUpload(event) {
             // Clear file input
             fileInput.value = '';
         } else {
-            showMessage(result.message || 'Failed to upload avatar', 'danger');
+            showMessage(result.error || result.message || 'Failed to upload avatar', 'danger');
         }
     } catch (error) {
         console.error('Avatar upload error:', error);
@@ -129,6 +135,21 @@ async function handleAvatarUpload(event) {
     }
 }
 
+/**
+ * Poll an avatar upload job until it is done or failed
+ */
+async function waitForAvatarJob(statusUrl, intervalMs = 1000, maxPolls = 120) {
+    for (let i = 0; i < maxPolls; i++) {
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+        const response = await fetch(statusUrl);
+        const job = await response.json();
+        if (!job.success || job.status === 'done' || job.status === 'failed') {
+            return job;
+        }
+    }
+    return { success: false, message: 'Avatar processing is taking too long.' };
+}
+
 
 /**
  * ============================================
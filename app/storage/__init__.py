@@ -0,0 +1,39 @@
+from flask import current_app
+from .base import StorageBackend
+from .local import LocalStorage
+from .s3 import S3Storage
+
+
+def make_storage(config):
+    """Build the backend selected by ``STORAGE_BACKEND``"""
+    backend = config.get("STORAGE_BACKEND", "s3")
+    if backend == "s3":
+        return S3Storage(
+            max_pool_connections=config.get("S3_MAX_POOL_CONNECTIONS"),
+            multipart_threshold=config.get("S3_MULTIPART_THRESHOLD"),
+            multipart_chunksize=config.get("S3_MULTIPART_CHUNKSIZE"),
+            max_concurrency=config.get("S3_TRANSFER_CONCURRENCY"),
+        )
+    if backend == "local":
+        return LocalStorage(config["STORAGE_LOCAL_ROOT"], config["SECRET_KEY"])
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {backend}")
+
+
+def init_app(app):
+    """Attach the configured storage backend to the app"""
+    app.extensions["storage"] = make_storage(app.config)
+
+
+def get_storage():
+    """Returns the storage backend of the current app"""
+    return current_app.extensions["storage"]
+
+
+__all__ = [
+    "LocalStorage",
+    "S3Storage",
+    "StorageBackend",
+    "get_storage",
+    "init_app",
+    "make_storage",
+]
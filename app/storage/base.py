@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+
+
+class StorageBackend(ABC):
+    """Interface every object storage backend implements.
+
+    Keys are slash-separated paths such as ``avatars/12/<uuid>/64.webp``.
+    """
+
+    @abstractmethod
+    def put(self, data, key, content_type):
+        """Store ``data`` (bytes or a readable file object) under ``key``"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_url(self, key, expires_in=3600):
+        """Temporary URL a browser can fetch the object from"""
+        raise NotImplementedError
+
+    def get_urls(self, keys, expires_in=3600):
+        """{key: url} for many keys; duplicate and empty keys are skipped"""
+        return {
+            key: self.get_url(key, expires_in)
+            for key in dict.fromkeys(k for k in keys if k)
+        }
+
+    @abstractmethod
+    def delete(self, key):
+        """Remove an object; deleting a missing key is not an error"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def exists(self, key):
+        """Whether an object is stored under ``key``"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def download(self, key, fileobj):
+        """Copy an object into ``fileobj``; FileNotFoundError if missing"""
+        raise NotImplementedError
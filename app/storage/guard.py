@@ -0,0 +1,101 @@
+import hashlib
+import os
+from collections import namedtuple
+
+# Leading bytes of the formats we accept, checked instead of the
+# client-declared Content-Type
+MAGIC_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+_SNIFF_BYTES = 12
+# Room for the multipart boundary and part headers around the file itself
+MULTIPART_OVERHEAD = 16 * 1024
+
+UploadInfo = namedtuple("UploadInfo", ["size", "sha256", "mimetype"])
+
+
+class UploadRejected(ValueError):
+    """The upload failed validation"""
+
+
+class UploadTooLarge(UploadRejected):
+    """The upload is bigger than the configured byte limit"""
+
+
+def check_content_length(content_length, max_bytes):
+    """Refuse a request whose body cannot hold a file of ``max_bytes``.
+
+    Call it before touching request.files: parsing the form reads the whole
+    body to a temporary file first, so only the declared Content-Length can
+    stop an oversized upload early. Bodies without one are still capped by
+    MAX_CONTENT_LENGTH.
+    """
+    if (
+        content_length is not None
+        and content_length > max_bytes + MULTIPART_OVERHEAD
+    ):
+        raise UploadTooLarge(f"File is larger than {max_bytes // 1024} KB")
+
+
+def sniff_mimetype(head):
+    """Detect the file type from its first bytes, None if unknown"""
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, mimetype in MAGIC_SIGNATURES:
+        if head.startswith(signature):
+            return mimetype
+    return None
+
+
+def spool_upload(stream, path, max_bytes, allowed_types, chunk_size=65536):
+    """Copy an upload stream to ``path``, validating it while reading.
+
+    Fails once ``max_bytes`` is exceeded or when the leading bytes do not
+    match an allowed type, and hashes the content on the way through.
+    The partial file is removed on rejection. For form uploads the request
+    body has already been received by then; see check_content_length.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    mimetype = None
+    try:
+        with open(path, "wb") as out:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(
+                        f"File is larger than {max_bytes // 1024} KB"
+                    )
+                if mimetype is None and len(head) < _SNIFF_BYTES:
+                    head += chunk[:_SNIFF_BYTES]
+                    if len(head) >= _SNIFF_BYTES:
+                        mimetype = _check_type(head, allowed_types)
+                digest.update(chunk)
+                out.write(chunk)
+        if mimetype is None:
+            mimetype = _check_type(head, allowed_types)
+    except BaseException:
+        _remove(path)
+        raise
+    return UploadInfo(size, digest.hexdigest(), mimetype)
+
+
+def _check_type(head, allowed_types):
+    mimetype = sniff_mimetype(head)
+    if mimetype not in allowed_types:
+        raise UploadRejected("Unsupported file type")
+    return mimetype
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
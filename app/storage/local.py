@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+from flask import url_for
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from .base import StorageBackend
+
+
+class LocalStorage(StorageBackend):
+    """Objects stored on the local filesystem and served by Flask.
+
+    Meant for development, CI and load tests without AWS. URLs carry a
+    signed token so objects stay private like presigned S3 URLs.
+    """
+
+    def __init__(self, root, secret_key):
+        self.root = os.path.abspath(root)
+        self._signer = URLSafeTimedSerializer(secret_key, salt="local-storage")
+        os.makedirs(self.root, exist_ok=True)
+
+    def path_for(self, key):
+        path = os.path.abspath(os.path.join(self.root, key))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def put(self, data, key, content_type):
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                if isinstance(data, (bytes, bytearray)):
+                    tmp.write(data)
+                else:
+                    shutil.copyfileobj(data, tmp)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return key
+
+    def get_url(self, key, expires_in=3600):
+        token = self._signer.dumps({"key": key, "ttl": expires_in})
+        return url_for("storage.serve", key=key, token=token)
+
+    def verify(self, key, token):
+        """True if ``token`` was issued for ``key`` and has not expired"""
+        try:
+            payload = self._signer.loads(token)
+            # Expiry is checked against the ttl embedded in the token
+            self._signer.loads(token, max_age=payload["ttl"])
+        except BadSignature:  # includes SignatureExpired
+            return False
+        return payload["key"] == key
+
+    def delete(self, key):
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    def exists(self, key):
+        return os.path.isfile(self.path_for(key))
+
+    def download(self, key, fileobj):
+        with open(self.path_for(key), "rb") as source:
+            shutil.copyfileobj(source, fileobj)
@@ -0,0 +1,24 @@
+import mimetypes
+from flask import Blueprint, abort, request, send_file
+from . import get_storage
+from .local import LocalStorage
+
+storage = Blueprint("storage", __name__)
+
+
+@storage.route("/storage/<path:key>", methods=["GET"])
+def serve(key):
+    """Serve an object of the local storage backend"""
+    backend = get_storage()
+    if not isinstance(backend, LocalStorage):
+        abort(404)
+    if not backend.verify(key, request.args.get("token", "")):
+        abort(403)
+    try:
+        path = backend.path_for(key)
+    except ValueError:
+        abort(404)
+    if not backend.exists(key):
+        abort(404)
+    mimetype, _ = mimetypes.guess_type(key)
+    return send_file(path, mimetype=mimetype or "application/octet-stream")
@@ -0,0 +1,36 @@
+from app.aws import s3
+from .base import StorageBackend
+
+
+class S3Storage(StorageBackend):
+    """Private S3 bucket; URLs are (cached) presigned GET URLs.
+
+    ``max_pool_connections`` sizes the HTTP pool shared by request threads;
+    ``multipart_threshold``, ``multipart_chunksize`` and ``max_concurrency``
+    tune managed transfers of large files.
+    """
+
+    def __init__(self, **tuning):
+        s3.configure(**tuning)
+
+    def put(self, data, key, content_type):
+        if isinstance(data, (bytes, bytearray)):
+            s3.upload_bytes_private(bytes(data), key, content_type)
+        else:
+            s3.upload_fileobj_to_key(data, key, content_type)
+        return key
+
+    def get_url(self, key, expires_in=3600):
+        return s3.presigned_get_url(key, expires_in)
+
+    def get_urls(self, keys, expires_in=3600):
+        return s3.presign_many(keys, expires_in)
+
+    def delete(self, key):
+        s3.delete_object(key)
+
+    def exists(self, key):
+        return s3.object_exists(key)
+
+    def download(self, key, fileobj):
+        s3.download_fileobj(key, fileobj)
@@ -0,0 +1,51 @@
+"""Baseline helpers shared by the benchmark scripts."""
+
+import json
+import os
+
+
+def add_baseline_args(parser):
+    parser.add_argument("--save", metavar="PATH", help="write a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline to check")
+    parser.add_argument("--max-regression", type=float, default=0.20)
+
+
+def save(path, report):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+        fh.write("\n")
+
+
+def regressions(current, baseline, metrics, max_regression):
+    """Compare flat {name: value} metrics.
+
+    ``metrics`` maps a metric name to "lower" or "higher" (which direction
+    is better). Returns a list of human readable failures.
+    """
+    failures = []
+    for name, better in metrics.items():
+        if name not in current or name not in baseline:
+            continue
+        old, new = baseline[name], current[name]
+        if better == "lower" and new > old * (1 + max_regression):
+            failures.append(f"{name}: {new} > {old} (+{max_regression:.0%})")
+        if better == "higher" and new < old * (1 - max_regression):
+            failures.append(f"{name}: {new} < {old} (-{max_regression:.0%})")
+    return failures
+
+
+def check(args, report, metrics):
+    """Handle --save/--compare; returns the process exit status"""
+    if args.save:
+        save(args.save, report)
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    failures = regressions(report, baseline, metrics, args.max_regression)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if not failures:
+        print(f"OK: within {args.max_regression:.0%} of baseline")
+    return 1 if failures else 0
@@ -0,0 +1,145 @@
+"""Bytes and CPU spent serializing and compressing API responses.
+
+Seeds a scratch database, takes the full /api/projects payload (every
+description included) and reports, per encoder and per compression
+setting, the response size and CPU time per call; then requests
+/api/projects end to end with each Accept-Encoding:
+
+    python benchmarks/bench_api_serialization.py --users 500
+    python benchmarks/bench_api_serialization.py --save baseline.json
+
+orjson, msgpack and brotli are optional: rows for missing ones are
+skipped. ``DATABASE_URL`` selects the database (a temporary SQLite file
+by default); it must be disposable.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from baseline import add_baseline_args, check  # noqa: E402
+
+
+def cpu_ms(fn, repeat):
+    """Median CPU milliseconds of one call"""
+    samples = []
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        samples.append(time.process_time() - start)
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=500,
+        help="Seeded users (projects: 2 per user)",
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    add_baseline_args(parser)
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        scratch = tempfile.mkdtemp(prefix="bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{scratch}/bench.db"
+    os.environ.setdefault("STORAGE_BACKEND", "local")
+    os.environ.setdefault(
+        "STORAGE_LOCAL_ROOT", tempfile.mkdtemp(prefix="bench-")
+    )
+
+    from flask.json.provider import DefaultJSONProvider
+
+    from app import create_app
+    from app.extensions import db
+    from app.responses import FastJSONProvider, compress, provider
+    from app.responses.compression import brotli
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        result = app.test_cli_runner().invoke(
+            args=["seed", "--users", str(args.users)]
+        )
+        if result.exit_code:
+            raise SystemExit(f"seeding failed:\n{result.output}")
+
+    client = app.test_client()
+    response = client.get("/api/projects")
+    with app.app_context():
+        payload = app.json.loads(response.get_data())
+        stdlib = DefaultJSONProvider(app)
+        fast = FastJSONProvider(app)
+        body = fast.dumps(payload).encode()
+
+        report = {
+            "projects": len(payload["projects"]),
+            "orjson": provider.orjson is not None,
+            "json_bytes": len(body),
+            "json_stdlib_ms": cpu_ms(
+                lambda: stdlib.dumps(payload, separators=(",", ":")),
+                args.repeat,
+            ),
+            "json_fast_ms": cpu_ms(lambda: fast.dumps(payload), args.repeat),
+        }
+    if provider.msgpack is not None:
+        packed = provider.msgpack.packb(payload)
+        report["msgpack_bytes"] = len(packed)
+        report["msgpack_ms"] = cpu_ms(
+            lambda: provider.msgpack.packb(payload), args.repeat
+        )
+
+    settings = [("gzip", level) for level in (1, 5, 6, 9)]
+    if brotli is not None:
+        settings += [("br", quality) for quality in (1, 5, 11)]
+    for encoding, level in settings:
+        name = f"{encoding}{level}"
+        kwargs = (
+            {"gzip_level": level}
+            if encoding == "gzip"
+            else {"brotli_quality": level}
+        )
+        report[f"{name}_bytes"] = len(compress(body, encoding, **kwargs))
+        report[f"{name}_ms"] = cpu_ms(
+            lambda: compress(body, encoding, **kwargs), args.repeat
+        )
+
+    # End to end with the app's configured provider and compression
+    for encoding in ("identity", "gzip") + (("br",) if brotli else ()):
+        latencies, size = [], 0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            response = client.get(
+                "/api/projects", headers={"Accept-Encoding": encoding}
+            )
+            latencies.append(time.perf_counter() - start)
+            size = len(response.get_data())
+        report[f"e2e_{encoding}_ms"] = round(
+            statistics.median(latencies) * 1000, 2
+        )
+        report[f"e2e_{encoding}_bytes"] = size
+
+    print(json.dumps(report, indent=2))
+    return check(
+        args,
+        report,
+        {
+            "json_fast_ms": "lower",
+            "gzip5_bytes": "lower",
+            "e2e_gzip_ms": "lower",
+            "e2e_gzip_bytes": "lower",
+        },
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
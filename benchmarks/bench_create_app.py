@@ -0,0 +1,76 @@
+"""Cold-start benchmark for create_app().
+
+Every run starts a fresh interpreter, so import time is included:
+
+    python benchmarks/bench_create_app.py --runs 15
+    python benchmarks/bench_create_app.py --save baseline.json
+    python benchmarks/bench_create_app.py --compare baseline.json
+
+``--compare`` exits with status 1 when the median is more than
+``--max-regression`` (default 20%) slower than the stored baseline.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from baseline import add_baseline_args, check
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy optional modules that should not be loaded just to boot the app
+WATCHED_MODULES = ("boto3", "botocore")
+
+CHILD = f"""
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [m for m in {WATCHED_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def run_once():
+    env = dict(os.environ)
+    # No database connection is opened by create_app(); any URL will do
+    env.setdefault("DATABASE_URL", "sqlite://")
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    add_baseline_args(parser)
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    timings = sorted(r["seconds"] * 1000 for r in results)
+    report = {
+        "runs": args.runs,
+        "median_ms": round(statistics.median(timings), 1),
+        "min_ms": round(timings[0], 1),
+        "max_ms": round(timings[-1], 1),
+        "loaded_modules": sorted({m for r in results for m in r["loaded"]}),
+    }
+    print(json.dumps(report, indent=2))
+
+    return check(args, report, {"median_ms": "lower"})
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""End-to-end latency benchmark of the hot endpoints.
+
+Boots create_app() against a database filled by ``flask seed``, then
+drives every endpoint in DEFAULT_ENDPOINTS from concurrent clients (each
+logged in as a different seeded user) and reports, per endpoint,
+p50/p95/p99 latency, throughput, SQL statements per request and peak RSS:
+
+    python benchmarks/bench_endpoints.py --users 2000 --concurrency 8
+    python benchmarks/bench_endpoints.py --save baseline.json
+    python benchmarks/bench_endpoints.py --compare baseline.json
+
+Requests go through the WSGI stack in process (Werkzeug test client), so
+the numbers cover routing, views, SQL and templates but not a server or
+the network. ``DATABASE_URL`` selects the database (a temporary SQLite
+file by default); it must be disposable since tables are created and
+seeded.
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from baseline import add_baseline_args, check  # noqa: E402
+
+QUERIES = ("data", "robot", "py", "cloud", "sensor", "learning", "zz")
+
+
+# name -> fn(data, rng) returning (method, url, json body)
+ENDPOINTS = {
+    "home": lambda data, rng: ("GET", "/", None),
+    "dashboard": lambda data, rng: ("GET", "/dashboard", None),
+    "dashboard_filtered": lambda data, rng: (
+        "GET",
+        "/dashboard?sectors={}&people_counts=4-6&skills=Python".format(
+            rng.choice(("web", "ai", "embedded"))
+        ),
+        None,
+    ),
+    "search_page": lambda data, rng: (
+        "GET",
+        f"/search/all?q={rng.choice(QUERIES)}",
+        None,
+    ),
+    "project_gui": lambda data, rng: (
+        "GET",
+        f"/project/{rng.choice(data['projects'])}/gui",
+        None,
+    ),
+    "profile": lambda data, rng: (
+        "GET",
+        f"/u/{rng.choice(data['usernames'])}",
+        None,
+    ),
+    "login": lambda data, rng: (
+        "POST",
+        "/api/login",
+        {"username": rng.choice(data["usernames"]), "password": "password"},
+    ),
+}
+
+# search/all.html builds "See all" and per-skill links with url_for() to
+# endpoints that do not exist, so /search/all answers 500 for most queries.
+# It stays measurable with --endpoints search_page (the errors are
+# reported) but is left out of the default run until the template is fixed
+DEFAULT_ENDPOINTS = [name for name in ENDPOINTS if name != "search_page"]
+
+
+def _rss_bytes():
+    """Current resident set size (Linux), else the process peak so far"""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RssSampler(threading.Thread):
+    """Samples RSS every few milliseconds and keeps the maximum"""
+
+    def __init__(self, interval=0.005):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = _rss_bytes()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        return max(self.peak, _rss_bytes())
+
+
+def seed_database(app, args):
+    from sqlalchemy import select
+
+    from app.auth.models import User
+    from app.extensions import db
+    from app.projects.models import Project
+
+    with app.app_context():
+        db.create_all()
+        result = app.test_cli_runner().invoke(
+            args=[
+                "seed",
+                "--users",
+                str(args.users),
+                "--seed",
+                str(args.seed),
+            ]
+        )
+        if result.exit_code:
+            raise SystemExit(f"seeding failed:\n{result.output}")
+        usernames = db.session.scalars(
+            select(User.username).where(User.username.like("s%_user%"))
+        ).all()
+        projects = db.session.scalars(select(Project.id)).all()
+    return {"usernames": usernames, "projects": projects}
+
+
+def make_clients(app, data, count):
+    clients = []
+    for i in range(count):
+        client = app.test_client()
+        response = client.post(
+            "/api/login",
+            json={
+                "username": data["usernames"][i % len(data["usernames"])],
+                "password": "password",
+            },
+        )
+        if response.status_code != 200:
+            raise SystemExit(
+                f"login failed: {response.get_data(as_text=True)}"
+            )
+        clients.append(client)
+    return clients
+
+
+def run_endpoint(name, clients, data, requests, seed, counter):
+    build = ENDPOINTS[name]
+    latencies, statements, errors = [], [], []
+    lock = threading.Lock()
+    barrier = threading.Barrier(len(clients) + 1)
+
+    def worker(index, client):
+        rng = random.Random(f"{seed}-{name}-{index}")
+        local, local_sql, local_errors = [], [], []
+        barrier.wait()
+        for _ in range(requests):
+            method, url, body = build(data, rng)
+            counter.value = 0
+            start = time.perf_counter()
+            response = client.open(url, method=method, json=body)
+            local.append(time.perf_counter() - start)
+            local_sql.append(counter.value)
+            if response.status_code >= 400:
+                local_errors.append(f"{response.status_code} {url}")
+        with lock:
+            latencies.extend(local)
+            statements.extend(local_sql)
+            errors.extend(local_errors)
+
+    threads = [
+        threading.Thread(target=worker, args=(i, client))
+        for i, client in enumerate(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    sampler = RssSampler()
+    sampler.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    peak = sampler.stop()
+
+    latencies.sort()
+    total = len(latencies)
+
+    def pct(p):
+        return round(latencies[max(0, int(total * p) - 1)] * 1000, 2)
+
+    return {
+        "requests": total,
+        "errors": len(errors),
+        "error_sample": errors[:3],
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "sql_per_request": round(statistics.mean(statements), 2),
+        "peak_rss_mb": round(peak / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=1000,
+        help="Seeded users (projects: 2 per user)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=50,
+        help="Requests per client per endpoint",
+    )
+    parser.add_argument(
+        "--endpoints",
+        default=",".join(DEFAULT_ENDPOINTS),
+        help="Comma-separated subset of: " + ", ".join(ENDPOINTS),
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=3,
+        help="Untimed requests per endpoint before measuring",
+    )
+    add_baseline_args(parser)
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        scratch = tempfile.mkdtemp(prefix="bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{scratch}/bench.db"
+    os.environ.setdefault(
+        "STORAGE_LOCAL_ROOT", tempfile.mkdtemp(prefix="bench-")
+    )
+
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    from app import create_app
+
+    app = create_app()
+    # Every client logs in from 127.0.0.1 and the login endpoint is
+    # hammered on purpose, so the throttle would only measure itself
+    app.config["LOGIN_THROTTLE_ENABLED"] = False
+    data = seed_database(app, args)
+
+    counter = threading.local()
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _count(*_args):
+        counter.value = getattr(counter, "value", 0) + 1
+
+    clients = make_clients(app, data, args.concurrency)
+    endpoints = [name.strip() for name in args.endpoints.split(",") if name]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name in endpoints:
+        if args.warmup:
+            run_endpoint(name, clients[:1], data, args.warmup, -1, counter)
+        results[name] = run_endpoint(
+            name, clients, data, args.requests, args.seed, counter
+        )
+        r = results[name]
+        print(
+            f"{name:20} {r['rps']:8.1f} req/s  p50 {r['p50_ms']:7.2f}  "
+            f"p95 {r['p95_ms']:7.2f}  p99 {r['p99_ms']:7.2f} ms  "
+            f"{r['sql_per_request']:5.1f} sql/req  {r['peak_rss_mb']} MB"
+            + (f"  {r['errors']} errors" if r["errors"] else ""),
+            file=sys.stderr,
+        )
+
+    report = {
+        "database": app.config["SQLALCHEMY_DATABASE_URI"].split(":", 1)[0],
+        "users": args.users,
+        "concurrency": args.concurrency,
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+        ),
+        "endpoints": results,
+    }
+    # Flat keys so baseline.regressions() can compare them
+    metrics = {}
+    for name in results:
+        for key, better in (
+            ("p95_ms", "lower"),
+            ("rps", "higher"),
+            ("sql_per_request", "lower"),
+        ):
+            report[f"{name}.{key}"] = results[name][key]
+            metrics[f"{name}.{key}"] = better
+    print(json.dumps(report, indent=2))
+
+    status = check(args, report, metrics)
+    failed = [name for name, r in results.items() if r["errors"]]
+    if failed:
+        print(f"ERRORS in {', '.join(failed)}")
+        return 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
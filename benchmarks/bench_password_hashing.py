@@ -0,0 +1,119 @@
+"""Login throughput of the password hashing pool against its size.
+
+Client threads play concurrent logins, each verifying a password through
+PasswordHasher; a probe thread meanwhile times a small pure-Python task
+to show how much hashing slows down unrelated request handling.
+
+    python benchmarks/bench_password_hashing.py
+    python benchmarks/bench_password_hashing.py --workers 0,1,2,4 --clients 16
+    python benchmarks/bench_password_hashing.py --method pbkdf2:sha256:600000
+
+Worker count 0 hashes inline in the client threads, as before the pool.
+``--save``/``--compare`` track logins_per_s at the largest worker count.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+from baseline import add_baseline_args, check
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.auth.hashing import (  # noqa: E402
+    DEFAULT_METHOD,
+    HashingBusy,
+    PasswordHasher,
+    _hash,
+)
+
+
+def _probe(stop, samples):
+    # Stands in for an unrelated, cheap request handled meanwhile
+    while not stop.is_set():
+        start = time.perf_counter()
+        sum(i * i for i in range(20000))
+        samples.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.005)
+
+
+def run(workers, clients, duration, method):
+    hasher = PasswordHasher(workers, queue_size=clients, method=method)
+    pwhash = _hash("correct horse", method)
+    hasher.verify(pwhash, "correct horse")  # start the worker processes
+
+    done, rejected = [0], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        while time.perf_counter() < deadline:
+            try:
+                hasher.verify(pwhash, "correct horse")
+                outcome = done
+            except HashingBusy:
+                outcome = rejected
+            with lock:
+                outcome[0] += 1
+
+    stop, samples = threading.Event(), []
+    probe = threading.Thread(target=_probe, args=(stop, samples))
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    started = time.perf_counter()
+    probe.start()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    probe.join()
+    hasher.shutdown()
+
+    return {
+        "workers": workers,
+        "logins_per_s": round(done[0] / elapsed, 1),
+        "rejected": rejected[0],
+        "probe_p50_ms": round(statistics.median(samples), 2),
+        "probe_max_ms": round(max(samples), 2),
+    }
+
+
+def main():
+    cores = os.cpu_count() or 1
+    default_workers = sorted({0, 1, max(cores // 2, 1), cores})
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        default=",".join(map(str, default_workers)),
+        help="comma-separated pool sizes (0 = inline)",
+    )
+    parser.add_argument("--clients", type=int, default=max(2 * cores, 4))
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--method", default=DEFAULT_METHOD)
+    add_baseline_args(parser)
+    args = parser.parse_args()
+
+    runs = [
+        run(int(w), args.clients, args.duration, args.method)
+        for w in args.workers.split(",")
+    ]
+    report = {
+        "cores": cores,
+        "clients": args.clients,
+        "method": args.method,
+        "runs": runs,
+        "logins_per_s": runs[-1]["logins_per_s"],
+    }
+    print(json.dumps(report, indent=2))
+
+    return check(args, report, {"logins_per_s": "higher"})
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Upload throughput of the storage backends under concurrent requests.
+
+Each worker thread plays one request: it pushes an app context and
+stores avatar-sized objects through get_storage().put().
+
+    python benchmarks/bench_storage_upload.py --backend local
+    S3_BUCKET=... S3_ENDPOINT_URL=http://localhost:9000 \\
+        python benchmarks/bench_storage_upload.py --backend s3 \\
+        --pool-connections 32 --concurrency 1,8,32
+
+The S3 backend needs credentials and a bucket (AWS or a local stand-in
+such as MinIO). ``--save``/``--compare`` track objects_per_s at the
+highest concurrency level.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from baseline import add_baseline_args, check
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def run_level(app, concurrency, uploads, payload):
+    from app.storage import get_storage
+
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency + 1)
+
+    def worker():
+        local = []
+        with app.app_context():
+            storage = get_storage()
+            barrier.wait()
+            for _ in range(uploads):
+                key = f"bench/{uuid.uuid4()}.jpg"
+                start = time.perf_counter()
+                storage.put(payload, key, "image/jpeg")
+                local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies)
+    return {
+        "concurrency": concurrency,
+        "objects": total,
+        "objects_per_s": round(total / elapsed, 1),
+        "mb_per_s": round(total * len(payload) / elapsed / 1e6, 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(total * 0.95) - 1] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("local", "s3"), default="local")
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--uploads", type=int, default=50, help="per thread")
+    parser.add_argument("--size-kb", type=int, default=48)
+    parser.add_argument("--pool-connections", type=int)
+    add_baseline_args(parser)
+    args = parser.parse_args()
+
+    os.environ["STORAGE_BACKEND"] = args.backend
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    if args.backend == "local":
+        os.environ["STORAGE_LOCAL_ROOT"] = tempfile.mkdtemp(prefix="bench-")
+    if args.pool_connections:
+        os.environ["S3_MAX_POOL_CONNECTIONS"] = str(args.pool_connections)
+
+    from app import create_app
+
+    app = create_app()
+    payload = os.urandom(args.size_kb * 1024)
+    levels = [
+        run_level(app, int(level), args.uploads, payload)
+        for level in args.concurrency.split(",")
+    ]
+    report = {"backend": args.backend, "size_kb": args.size_kb}
+    report["levels"] = levels
+    report["objects_per_s"] = levels[-1]["objects_per_s"]
+    print(json.dumps(report, indent=2))
+    return check(args, report, {"objects_per_s": "higher"})
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""Query-plan regression check for the app's hot lookups.
+
+Seeds a database, runs EXPLAIN on every query in HOT_QUERIES and exits
+with status 1 if any of them reads its table with a sequential scan:
+
+    python benchmarks/check_query_plans.py             # in-memory SQLite
+    DATABASE_URL=postgresql://.../scratch_db \\
+        python benchmarks/check_query_plans.py --rows 5000
+
+The target database must be disposable: tables are created and seeded.
+On PostgreSQL sequential scans are disabled for the check (enable_seqscan
+= off) so that a missing index shows up even on small tables.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import exists, insert, or_, select, text  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.auth.models import User  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.profile.models import UserSkill  # noqa: E402
+from app.projects.models import (  # noqa: E402
+    Application,
+    ChatMessage,
+    Project,
+    ProjectLink,
+    ProjectNote,
+    Task,
+)
+
+# name -> (table that must be read through an index, statement)
+HOT_QUERIES = {
+    "dashboard user_projects": (
+        "projects",
+        select(Project).where(Project.creator_id == 1),
+    ),
+    "dashboard sector filter": (
+        "projects",
+        select(Project).where(Project.sector.in_(["sector-1", "sector-2"])),
+    ),
+    "applications of a project": (
+        "applications",
+        select(Application).where(Application.project_id == 1),
+    ),
+    "applications of a user": (
+        "applications",
+        select(Application).where(Application.applicant_id == 1),
+    ),
+    "profile participation": (
+        "applications",
+        select(Project.id).where(
+            or_(
+                Project.creator_id == 1,
+                exists().where(
+                    Application.project_id == Project.id,
+                    Application.applicant_id == 1,
+                ),
+            )
+        ),
+    ),
+    "project tasks": ("tasks", select(Task).where(Task.project_id == 1)),
+    "project links": (
+        "project_links",
+        select(ProjectLink).where(ProjectLink.project_id == 1),
+    ),
+    "project chat": (
+        "chat_messages",
+        select(ChatMessage).where(ChatMessage.project_id == 1),
+    ),
+    "project note lookup": (
+        "project_notes",
+        select(ProjectNote).where(
+            ProjectNote.project_id == 1,
+            ProjectNote.author_id == 1,
+            ProjectNote.title.is_(None),
+        ),
+    ),
+    "people directory": (
+        "user_skills",
+        select(UserSkill.user_id).where(
+            UserSkill.skill_id.in_([1, 2]),
+            UserSkill.level_rank >= 3,
+            UserSkill.years >= 3,
+        ),
+    ),
+}
+
+
+def seed(rows):
+    users = [
+        {
+            "username": f"plan{i}",
+            "email": f"plan{i}@example.com",
+            "password": "x",
+        }
+        for i in range(1, rows + 1)
+    ]
+    db.session.execute(insert(User), users)
+    user_ids = db.session.scalars(select(User.id)).all()
+
+    db.session.execute(
+        insert(Project),
+        [
+            {
+                "name": f"p{i}",
+                "description": "d",
+                "sector": f"sector-{i % 20}",
+                "people_count": i % 9,
+                "skills": "Python",
+                "creator_id": user_ids[i % len(user_ids)],
+            }
+            for i in range(rows)
+        ],
+    )
+    project_ids = db.session.scalars(select(Project.id)).all()
+
+    def per_project(extra):
+        return [
+            {"project_id": pid, **extra(i)}
+            for i, pid in enumerate(project_ids)
+        ]
+
+    db.session.execute(
+        insert(Application),
+        per_project(
+            lambda i: {
+                "applicant_id": user_ids[(i * 7) % len(user_ids)],
+                "information": "i",
+                "skills": "s",
+            }
+        ),
+    )
+    db.session.execute(
+        insert(Task),
+        per_project(lambda i: {"title": f"t{i}", "is_done": False}),
+    )
+    db.session.execute(
+        insert(ProjectLink),
+        per_project(lambda i: {"label": "l", "url": "https://example.com"}),
+    )
+    db.session.execute(
+        insert(ChatMessage),
+        per_project(
+            lambda i: {"author_id": user_ids[i % len(user_ids)], "body": "b"}
+        ),
+    )
+    db.session.execute(
+        insert(ProjectNote),
+        per_project(
+            lambda i: {
+                "author_id": user_ids[i % len(user_ids)],
+                "content": "c",
+            }
+        ),
+    )
+    db.session.commit()
+
+
+def sqlite_seq_scans(conn, sql, table):
+    plan = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    details = [row[-1] for row in plan]
+    # "SCAN <table>" without an index is a full table scan
+    bad = [
+        d
+        for d in details
+        if d.startswith(f"SCAN {table}") and "USING" not in d
+    ]
+    return bad, details
+
+
+def postgres_seq_scans(conn, sql, table):
+    conn.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    nodes, stack = [], [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get("Plans", ()))
+    bad = [
+        f"Seq Scan on {n['Relation Name']}"
+        for n in nodes
+        if n["Node Type"] == "Seq Scan" and n.get("Relation Name") == table
+    ]
+    details = [
+        f"{n['Node Type']} {n.get('Index Name') or n.get('Relation Name', '')}"
+        for n in nodes
+    ]
+    return bad, details
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(args.rows)
+        engine = db.engine
+        check = (
+            postgres_seq_scans
+            if engine.dialect.name == "postgresql"
+            else sqlite_seq_scans
+        )
+        if engine.dialect.name == "sqlite":
+            db.session.execute(text("ANALYZE"))
+
+        failures, report = [], {}
+        with engine.begin() as conn:
+            for name, (table, stmt) in HOT_QUERIES.items():
+                sql = stmt.compile(
+                    dialect=engine.dialect,
+                    compile_kwargs={"literal_binds": True},
+                )
+                bad, details = check(conn, str(sql), table)
+                report[name] = {"ok": not bad, "plan": details}
+                if bad:
+                    failures.append(f"{name}: {'; '.join(bad)}")
+
+    if args.verbose:
+        print(json.dumps(report, indent=2))
+    for name, result in report.items():
+        print(f"{'ok  ' if result['ok'] else 'SCAN'} {name}")
+    if failures:
+        print("\nSequential scans found:\n  " + "\n  ".join(failures))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""unique index on lower(skills.name)
+
+Revision ID: 5c1e7a9f2d36
+Revises: 8e41c7d0b5a2
+Create Date: 2026-10-19 12:41:05.327114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e7a9f2d36'
+down_revision = '8e41c7d0b5a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # skills/user_skills were created with db.create_all() before they had
+    # a migration; create them here on databases that lack them
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'skills' not in tables:
+        op.create_table('skills',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+    if 'user_skills' not in tables:
+        op.create_table('user_skills',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.Column('level', sa.String(length=50), nullable=True),
+        sa.Column('years', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'skill_id', name='uq_user_skill')
+        )
+        with op.batch_alter_table('user_skills', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_user_skills_skill_id'), ['skill_id'], unique=False)
+            batch_op.create_index(batch_op.f('ix_user_skills_user_id'), ['user_id'], unique=False)
+
+    # Fold skills differing only in case into the oldest one first
+    op.execute("""
+        DELETE FROM user_skills WHERE id IN (
+            SELECT us.id FROM user_skills us
+            JOIN skills s ON s.id = us.skill_id
+            JOIN skills keep ON lower(keep.name) = lower(s.name)
+                AND keep.id < s.id
+            JOIN user_skills other ON other.skill_id = keep.id
+                AND other.user_id = us.user_id
+        )
+    """)
+    op.execute("""
+        UPDATE user_skills SET skill_id = (
+            SELECT min(keep.id) FROM skills keep, skills s
+            WHERE s.id = user_skills.skill_id
+                AND lower(keep.name) = lower(s.name)
+        )
+    """)
+    op.execute("""
+        DELETE FROM skills WHERE id NOT IN (
+            SELECT min(id) FROM skills GROUP BY lower(name)
+        )
+    """)
+
+    op.create_index('uq_skills_name_lower', 'skills', [sa.text('lower(name)')], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_skills_name_lower', table_name='skills')
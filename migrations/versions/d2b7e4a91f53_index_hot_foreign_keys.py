@@ -0,0 +1,57 @@
+"""index hot foreign keys and projects.sector
+
+Revision ID: d2b7e4a91f53
+Revises: 9a4f3c2e7b18
+Create Date: 2026-10-19 14:05:31.662480
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b7e4a91f53'
+down_revision = '9a4f3c2e7b18'
+branch_labels = None
+depends_on = None
+
+# (index, table, columns)
+INDEXES = [
+    ('ix_applications_project_id', 'applications', ['project_id']),
+    ('ix_tasks_project_id', 'tasks', ['project_id']),
+    ('ix_chat_messages_project_id', 'chat_messages', ['project_id']),
+    ('ix_project_links_project_id', 'project_links', ['project_id']),
+    ('ix_project_notes_lookup', 'project_notes', ['project_id', 'author_id', 'title']),
+    ('ix_projects_sector', 'projects', ['sector']),
+]
+
+
+def _existing_tables():
+    # tasks, chat_messages, project_notes and project_links were created by
+    # db.create_all(), which already adds these indexes where missing
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    tables = _existing_tables()
+    online = op.get_bind().dialect.name == 'postgresql'
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if table in tables:
+                op.create_index(
+                    name, table, columns, unique=False, if_not_exists=True,
+                    postgresql_concurrently=online,
+                )
+
+
+def downgrade():
+    tables = _existing_tables()
+    online = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            if table in tables:
+                op.drop_index(
+                    name, table_name=table, if_exists=True,
+                    postgresql_concurrently=online,
+                )